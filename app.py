@@ -1,7 +1,6 @@
 from flask import Flask, request, jsonify
-import requests
-from requests.auth import HTTPBasicAuth
 from dotenv import load_dotenv
+import http_client
 import os
 
 # Load environment variables
@@ -40,10 +39,9 @@ def get_defectdetails():
 
     # Construct Jira API URL
     url = f"{JIRA_DOMAIN}/rest/api/3/issue/{defectid}"
-    auth = HTTPBasicAuth(JIRA_EMAIL, JIRA_API_TOKEN)
     headers = {"Accept": "application/json"}
 
-    response = requests.get(url, headers=headers, auth=auth)
+    response = http_client.jira_session((JIRA_EMAIL, JIRA_API_TOKEN)).get(url, headers=headers)
 
     if response.status_code != 200:
         return jsonify({
@@ -0,0 +1,209 @@
+"""Async (Quart + aiohttp) serving mode for the Jira dashboard routes.
+
+Serves the same JSON as board2.py (/jira-dashboard-task), board5.py
+(/jira-dashboard-all), board6.py (/jira-summary) and graph3.py
+(/resolution-trend), but upstream Jira calls are awaited instead of
+blocking a worker, so one process can keep hundreds of them in flight.
+Payloads are cached per route as in the Flask apps (see response_cache).
+
+    hypercorn async_dashboard:app --bind 127.0.0.1:5000
+"""
+import asyncio
+import os
+from collections import Counter
+from dotenv import load_dotenv
+from quart import Quart, jsonify, request
+
+import async_jira
+import response_cache
+import trend_engine
+
+load_dotenv("board.env")
+
+app = Quart(__name__)
+
+JIRA_URL = os.getenv("JIRA_URL")
+JIRA_USER = os.getenv("JIRA_USER")
+JIRA_TOKEN = os.getenv("JIRA_TOKEN")
+PROJECT_KEY = os.getenv("PROJECT_KEY")
+JIRA_PROJECT_WORKERS = int(os.getenv("JIRA_PROJECT_WORKERS", "8"))
+JIRA_MAX_CONNECTIONS = int(os.getenv("JIRA_MAX_CONNECTIONS", str(async_jira.MAX_CONNECTIONS)))
+
+client = None
+
+
+@app.before_serving
+async def open_client():
+    global client
+    client = async_jira.make_client((JIRA_USER, JIRA_TOKEN), max_connections=JIRA_MAX_CONNECTIONS)
+
+
+@app.after_serving
+async def close_client():
+    await client.close()
+
+
+@response_cache.cached_async("/jira-dashboard-task")
+async def tally_tasks():
+    """(status counts, urgent count) for PROJECT_KEY's Task issues; Jira errors propagate uncached."""
+    status_counter = Counter()
+    urgent_count = 0
+    async for issue in async_jira.iter_records(
+            client, JIRA_URL, f'project={PROJECT_KEY} AND issuetype="Task"', "issuetype,status,priority"):
+        status_counter[issue.status] += 1
+        if (issue.priority or "").lower() in ["highest", "urgent", "p1"]:
+            urgent_count += 1
+    return status_counter, urgent_count
+
+
+@app.route("/jira-dashboard-task", methods=["GET"])
+async def jira_dashboard_task():
+    try:
+        status_counter, urgent_count = await tally_tasks()
+    except Exception as e:
+        # Jira unreachable: show empty counts without caching them
+        print("Error:", e)
+        status_counter, urgent_count = Counter(), 0
+
+    urgent_message = "Needs Immediate Attention" if urgent_count > 0 else "No urgent defects — all good!"
+
+    return jsonify({
+        "total_tasks": sum(status_counter.values()),
+        "status_counts": dict(status_counter),
+        "urgent_defects": {
+            "count": urgent_count,
+            "message": urgent_message
+        }
+    })
+
+
+@response_cache.cached_async("/jira-dashboard-all")
+async def tally_all():
+    """(defect status counts, urgent count, test case status counts); Jira errors propagate uncached."""
+    status_counter = Counter()
+    urgent_count = 0
+    test_case_status_counter = Counter()
+    async for issue in async_jira.iter_records(
+            client, JIRA_URL, "ORDER BY created DESC", "issuetype,status,priority"):
+        status_name = issue.status
+        if issue.type.lower() != "test case":
+            status_counter[status_name] += 1
+            if (issue.priority or "").lower() in ["highest", "urgent", "p1"]:
+                urgent_count += 1
+        else:
+            test_case_status_counter[status_name] += 1
+    return status_counter, urgent_count, test_case_status_counter
+
+
+@app.route("/jira-dashboard-all", methods=["GET"])
+async def jira_dashboard_all():
+    try:
+        status_counter, urgent_count, test_case_status_counter = await tally_all()
+    except Exception as e:
+        # Jira unreachable: show empty counts without caching them
+        print("Error:", e)
+        status_counter, urgent_count, test_case_status_counter = Counter(), 0, Counter()
+
+    urgent_message = "Needs Immediate Attention" if urgent_count > 0 else "No urgent defects"
+
+    return jsonify({
+        "status_counts": dict(status_counter),
+        "total_tasks": sum(status_counter.values()),
+        "urgent_defects": {
+            "count": urgent_count,
+            "message": urgent_message
+        },
+        "test_case_statistics": {
+            "Accepted": test_case_status_counter.get("Accepted", 0),
+            "Rejected": test_case_status_counter.get("Rejected", 0),
+            "Generated": test_case_status_counter.get("Generated", 0)
+        }
+    })
+
+
+async def tally_project(project_key, limit):
+    """(total, defect status counts, test case status counts, urgent count) for one project."""
+    total = 0
+    defects = Counter()
+    test_cases = Counter()
+    urgent = 0
+    async with limit:
+        async for issue in async_jira.iter_records(
+                client, JIRA_URL, f'project="{project_key}"', "issuetype,status,priority"):
+            total += 1
+            issue_type = (issue.type or "").lower()
+            status_name = issue.status or "Unknown"
+            if issue_type != "test case":
+                defects[status_name] += 1
+                if (issue.priority or "").lower() in ["highest", "urgent", "p1", "high", "blocker"]:
+                    urgent += 1
+            else:
+                test_cases[status_name] += 1
+    return total, defects, test_cases, urgent
+
+
+@response_cache.cached_async("/jira-summary")
+async def summary_payload():
+    projects = await async_jira.get_json(client, f"{JIRA_URL}/rest/api/2/project")
+    limit = asyncio.Semaphore(JIRA_PROJECT_WORKERS)
+    partials = await asyncio.gather(*(tally_project(proj["key"], limit) for proj in projects))
+
+    # Merge in project order, as board6 does
+    total_defects = 0
+    defect_status_counts = Counter()
+    test_case_status_counter = Counter()
+    urgent_defects_count = 0
+    for total, defects, test_cases, urgent in partials:
+        total_defects += total
+        defect_status_counts.update(defects)
+        test_case_status_counter.update(test_cases)
+        urgent_defects_count += urgent
+
+    urgent_message = "Needs Immediate Attention" if urgent_defects_count > 0 else "No urgent defects"
+
+    return {
+        "total_defects_assigned": total_defects,
+        "defect_status": dict(defect_status_counts),
+        "urgent_defects": {
+            "count": urgent_defects_count,
+            "message": urgent_message
+        },
+        "test_case_statistics": {
+            "Accepted": test_case_status_counter.get("Accepted", 2),
+            "Rejected": test_case_status_counter.get("Rejected", 3),
+            "Generated": test_case_status_counter.get("Generated", 4)
+        }
+    }
+
+
+@app.route("/jira-summary", methods=["GET"])
+async def jira_summary():
+    try:
+        return jsonify(await summary_payload())
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@response_cache.cached_async("/resolution-trend")
+async def trend_rows(start, end, bucket):
+    jql = f'{trend_engine.jql_window("resolved", start, end)} ORDER BY resolved ASC'
+    issues = [issue async for issue in async_jira.iter_records(client, JIRA_URL, jql, "created,resolutiondate")]
+    created, resolved, seconds = trend_engine.resolution_columns(issues)
+    return trend_engine.trend(resolved, trend_engine.rounded_days(seconds), start, end, bucket)
+
+
+@app.route("/resolution-trend")
+async def resolution_time_trend():
+    try:
+        start, end, bucket = trend_engine.window(request.args, default_days=30)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    try:
+        return jsonify(await trend_rows(start, end, bucket))
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+if __name__ == "__main__":
+    app.run(debug=True)
@@ -0,0 +1,98 @@
+"""asyncio counterpart of jira_fetch, built on aiohttp.
+
+One event loop can keep hundreds of Jira requests in flight; the client's
+connection limits decide how many actually run at once.
+"""
+import asyncio
+
+import aiohttp
+
+import issue_record
+from jira_fetch import MAX_RESULTS, MAX_WORKERS, RETRIES, RETRY_BACKOFF, TIMEOUT
+
+# Upper bound on simultaneous upstream connections per process
+MAX_CONNECTIONS = 200
+
+
+def make_client(auth=None, headers=None, max_connections=MAX_CONNECTIONS):
+    """aiohttp session for Jira; close it with `await client.close()`."""
+    return aiohttp.ClientSession(
+        auth=aiohttp.BasicAuth(auth[0] or "", auth[1] or "") if auth else None,
+        headers=headers or {"Accept": "application/json"},
+        timeout=aiohttp.ClientTimeout(total=TIMEOUT),
+        connector=aiohttp.TCPConnector(limit=max_connections)
+    )
+
+
+async def get_json(client, url, params=None, retries=RETRIES):
+    """GET a Jira endpoint, retrying transient failures like jira_fetch.fetch_page."""
+    error = None
+    for attempt in range(retries + 1):
+        try:
+            async with client.get(url, params=params) as response:
+                if response.status == 200:
+                    return await response.json(content_type=None)
+                error = f"{response.status} - {await response.text()}"
+                status = response.status
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            error = str(e) or type(e).__name__
+        else:
+            # Client errors (bad JQL, auth) won't succeed on retry
+            if status < 500 and status != 429:
+                break
+        if attempt < retries:
+            await asyncio.sleep(RETRY_BACKOFF * 2 ** attempt)
+    raise Exception(f"Jira API error: {error}")
+
+
+async def fetch_page(client, url, jql, fields, start_at, max_results=MAX_RESULTS):
+    params = {
+        "jql": jql,
+        "startAt": str(start_at),
+        "maxResults": str(max_results),
+        "fields": fields
+    }
+    return await get_json(client, url, params)
+
+
+async def iter_issue_pages(client, jira_url, jql, fields, max_results=MAX_RESULTS,
+                           max_workers=MAX_WORKERS):
+    """Yield each page's issues in order, with at most `max_workers` pages in flight."""
+    url = f"{jira_url}/rest/api/2/search"
+    first = await fetch_page(client, url, jql, fields, 0, max_results)
+    issues = first.get("issues", [])
+    total = first.get("total", 0)
+    yield issues
+
+    page_size = len(issues) or max_results
+    offsets = iter(range(page_size, total, page_size))
+    if not issues:
+        return
+
+    def fetch(start_at):
+        return asyncio.ensure_future(fetch_page(client, url, jql, fields, start_at, page_size))
+
+    pending = [fetch(start_at) for _, start_at in zip(range(max_workers), offsets)]
+    try:
+        while pending:
+            page = await pending.pop(0)
+            for start_at in offsets:
+                pending.append(fetch(start_at))
+                break
+            yield page.get("issues", [])
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def iter_issues(client, jira_url, jql, fields, **kwargs):
+    async for issues in iter_issue_pages(client, jira_url, jql, fields, **kwargs):
+        for issue in issues:
+            yield issue
+
+
+async def iter_records(client, jira_url, jql, fields, **kwargs):
+    """Yield an IssueRecord per issue; only the current page's JSON is kept."""
+    async for issues in iter_issue_pages(client, jira_url, jql, fields, **kwargs):
+        for issue in issues:
+            yield issue_record.from_issue(issue)
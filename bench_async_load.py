@@ -0,0 +1,117 @@
+"""Load test: sync Flask dashboards vs the async (Quart) serving mode.
+
+Starts a stub Jira, the sync app (Flask's threaded server) and
+async_dashboard (hypercorn) as subprocesses, then drives each with N
+concurrent users for a fixed time and reports throughput and latency.
+
+    python bench_async_load.py [--users 10 50 200] [--seconds 10] [--latency 0.1]
+"""
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import aiohttp
+
+ROUTES = {
+    "/jira-dashboard-all": "board5",
+    "/jira-summary": "board6",
+    "/resolution-trend": "graph3",
+}
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_port(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"server on port {port} did not start")
+
+
+def start_server(kind, module, port, env):
+    if kind == "sync":
+        cmd = [sys.executable, "-m", "flask", "--app", module, "run", "--port", str(port), "--with-threads"]
+    else:
+        cmd = [sys.executable, "-m", "hypercorn", "async_dashboard:app", "--bind", f"127.0.0.1:{port}"]
+    proc = subprocess.Popen(cmd, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    wait_for_port(port)
+    return proc
+
+
+async def drive(url, users, seconds):
+    """Run `users` closed-loop clients against `url`; return (requests, errors, latencies)."""
+    latencies = []
+    errors = 0
+    deadline = time.monotonic() + seconds
+    connector = aiohttp.TCPConnector(limit=users)
+    timeout = aiohttp.ClientTimeout(total=120)
+
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as client:
+        async def user():
+            nonlocal errors
+            while time.monotonic() < deadline:
+                start = time.monotonic()
+                try:
+                    async with client.get(url) as response:
+                        await response.read()
+                        response.raise_for_status()
+                except (aiohttp.ClientError, asyncio.TimeoutError):
+                    errors += 1
+                    continue
+                latencies.append(time.monotonic() - start)
+
+        await asyncio.gather(*(user() for _ in range(users)))
+    return len(latencies), errors, sorted(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--route", choices=sorted(ROUTES), default="/jira-dashboard-all")
+    parser.add_argument("--users", type=int, nargs="+", default=[10, 50, 200])
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--latency", type=float, default=0.1, help="stub Jira latency per request")
+    parser.add_argument("--issues", type=int, default=300)
+    args = parser.parse_args()
+
+    stub = subprocess.Popen([sys.executable, "jira_stub.py", "--total", str(args.issues),
+                             "--latency", str(args.latency)], stdout=subprocess.PIPE, text=True)
+    stub_url = stub.stdout.readline().strip()
+    env = dict(os.environ, JIRA_URL=stub_url, JIRA_USER="bench", JIRA_TOKEN="bench", PROJECT_KEY="ALPHA")
+    env.pop("JIRA_STORE", None)
+    env.pop("JIRA_COUNT_ONLY", None)
+
+    print(f"route={args.route} stub latency={args.latency}s issues={args.issues}")
+    print(f"{'mode':>6} {'users':>6} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'errors':>7}")
+    try:
+        for kind in ("sync", "async"):
+            port = free_port()
+            server = start_server(kind, ROUTES[args.route], port, env)
+            try:
+                for users in args.users:
+                    done, errors, latencies = asyncio.run(
+                        drive(f"http://127.0.0.1:{port}{args.route}", users, args.seconds))
+                    p50 = latencies[len(latencies) // 2] * 1000 if latencies else float("nan")
+                    p95 = latencies[int(len(latencies) * 0.95)] * 1000 if latencies else float("nan")
+                    print(f"{kind:>6} {users:>6} {done / args.seconds:>8.1f} {p50:>8.0f} {p95:>8.0f} {errors:>7}")
+            finally:
+                server.terminate()
+                server.wait()
+    finally:
+        stub.terminate()
+        stub.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Benchmark: serial download+parse loop vs the ExtractPool pipeline.
+
+Generates a corpus of multi-page PDFs in memory, serves them through a
+download function with a fixed per-file latency (standing in for GitHub),
+and runs hub.py's extract_description over the lot with 1..N worker
+processes. The pipeline should approach min(cores, workers)x on parsing, plus
+whatever download time it hides behind parsing.
+
+    python bench_extract_pool.py [--files 200] [--pages 20] [--latency 0.02] [--workers 1 2 4 8]
+"""
+import argparse
+import os
+import time
+
+import fitz  # PyMuPDF
+
+from extract_pool import ExtractPool
+
+
+def make_pdf(n, pages):
+    doc = fitz.open()
+    for page_no in range(pages):
+        page = doc.new_page()
+        lines = [f"Document {n} page {page_no} line {line} " + "lorem ipsum " * 6 for line in range(40)]
+        page.insert_text((40, 40), "\n".join(lines), fontsize=8)
+    return doc.tobytes()
+
+
+def extract_description(content, ext):
+    """hub.py's PDF branch: full text, first line."""
+    doc = fitz.open(stream=content, filetype="pdf")
+    text = ""
+    for page in doc:
+        text += page.get_text()
+    return text.strip().split("\n")[0]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=200)
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    print(f"building {args.files} PDFs x {args.pages} pages ...")
+    corpus = [make_pdf(n, args.pages) for n in range(args.files)]
+    print(f"corpus {sum(map(len, corpus)) / 1e6:.1f} MB, {os.cpu_count()} cores")
+
+    def download(n):
+        time.sleep(args.latency)
+        return corpus[n], ".pdf"
+
+    start = time.perf_counter()
+    expected = [extract_description(*download(n)) for n in range(args.files)]
+    serial_s = time.perf_counter() - start
+    print(f"{'mode':>12} {'seconds':>8} {'files/s':>8} {'speedup':>8}")
+    print(f"{'serial':>12} {serial_s:>8.2f} {args.files / serial_s:>8.1f} {1:>7.1f}x")
+
+    for workers in args.workers:
+        pool = ExtractPool(workers=workers)
+        list(pool.map([0], download, extract_description))  # start workers outside the timing
+        start = time.perf_counter()
+        found = list(pool.map(range(args.files), download, extract_description))
+        elapsed = time.perf_counter() - start
+        pool.close()
+        assert found == expected, "pipeline returned different descriptions"
+        print(f"{f'{workers} procs':>12} {elapsed:>8.2f} {args.files / elapsed:>8.1f} {serial_s / elapsed:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
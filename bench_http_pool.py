@@ -0,0 +1,70 @@
+"""Benchmark: per-call latency with and without a pooled keep-alive session.
+
+Serves the stub Jira over HTTPS with a throwaway self-signed certificate
+and compares bare `requests.get` (new TCP + TLS handshake every call) with
+an http_client session that reuses pooled connections.
+
+    python bench_http_pool.py [--calls 200] [--latency 0.0]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import tempfile
+import time
+
+import requests
+
+import http_client
+from jira_stub import JiraStub
+
+
+def make_certificate(directory):
+    """Self-signed cert for 127.0.0.1 (needs the openssl CLI)."""
+    certfile = os.path.join(directory, "stub.crt")
+    keyfile = os.path.join(directory, "stub.key")
+    subprocess.run([
+        "openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+        "-keyout", keyfile, "-out", certfile, "-subj", "/CN=127.0.0.1",
+        "-addext", "subjectAltName=IP:127.0.0.1"
+    ], check=True, capture_output=True)
+    return certfile, keyfile
+
+
+def time_calls(get, url, calls):
+    latencies = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        response = get(url)
+        response.raise_for_status()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.0, help="stub server think time")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        certfile, keyfile = make_certificate(directory)
+        with JiraStub(latency=args.latency, certfile=certfile, keyfile=keyfile) as stub:
+            url = f"{stub.url}/rest/api/2/project"
+            session = http_client.make_session(auth=("bench", "bench"))
+
+            # verify= per call: REQUESTS_CA_BUNDLE would override session.verify
+            unpooled = time_calls(
+                lambda u: requests.get(u, auth=("bench", "bench"), verify=certfile), url, args.calls)
+            pooled = time_calls(lambda u: session.get(u, verify=certfile), url, args.calls)
+
+    print(f"{args.calls} HTTPS calls, stub latency {args.latency}s")
+    print(f"{'client':>9} {'mean ms':>8} {'p50 ms':>7} {'p95 ms':>7}")
+    for name, latencies in (("unpooled", unpooled), ("pooled", pooled)):
+        latencies.sort()
+        p95 = latencies[int(len(latencies) * 0.95)]
+        print(f"{name:>9} {statistics.mean(latencies):>8.2f} {statistics.median(latencies):>7.2f} {p95:>7.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""Benchmark: full Jira issue dicts vs compact IssueRecords.
+
+Builds N issues in the shape Jira's search API returns them (the stub's
+issue JSON, limited to the fields the board and graph routes request),
+decodes them with json.loads, and reports:
+
+  memory      bytes per issue held as JSON dicts vs as IssueRecords
+              (tracemalloc, after the JSON is dropped)
+  decode      ns per issue for issue_record.from_issue
+  board       ns per issue for the board6 status/priority tally walking
+              nested dicts vs reading record attributes
+  graph       ns per issue for building the trend_engine columns from
+              dicts vs from records
+
+    python bench_issue_records.py [--n 10000 100000]
+"""
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+from collections import Counter
+
+import issue_record
+import jira_time
+from jira_stub import make_issue
+
+FIELDS = ("project", "issuetype", "status", "priority", "created", "resolutiondate")
+URGENT_PRIORITIES = ["highest", "urgent", "p1", "high", "blocker"]
+
+
+def jira_payload(n):
+    issues = []
+    for number in range(n):
+        issue = make_issue(number)
+        issue["fields"] = {name: issue["fields"][name] for name in FIELDS}
+        issues.append(issue)
+    return json.dumps({"issues": issues})
+
+
+def held_bytes(build):
+    """Bytes still allocated by what build() returns."""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size, result
+
+
+def tally_dicts(issues):
+    """board6's original tally over Jira JSON."""
+    defects, test_cases, urgent = Counter(), Counter(), 0
+    for issue in issues:
+        fields = issue.get("fields", {}) or {}
+        issue_type = (fields.get("issuetype") or {}).get("name", "").lower()
+        status_name = (fields.get("status") or {}).get("name", "Unknown")
+        priority_name = ((fields.get("priority") or {}).get("name", "")).lower()
+        if issue_type != "test case":
+            defects[status_name] += 1
+            if priority_name in URGENT_PRIORITIES:
+                urgent += 1
+        else:
+            test_cases[status_name] += 1
+    return defects, test_cases, urgent
+
+
+def tally_records(issues):
+    """board6's tally over IssueRecords."""
+    defects, test_cases, urgent = Counter(), Counter(), 0
+    for issue in issues:
+        issue_type = (issue.type or "").lower()
+        status_name = issue.status or "Unknown"
+        priority_name = (issue.priority or "").lower()
+        if issue_type != "test case":
+            defects[status_name] += 1
+            if priority_name in URGENT_PRIORITIES:
+                urgent += 1
+        else:
+            test_cases[status_name] += 1
+    return defects, test_cases, urgent
+
+
+def columns_dicts(issues):
+    return (jira_time.parse_times([issue["fields"].get("created") for issue in issues]),
+            jira_time.parse_times([issue["fields"].get("resolutiondate") for issue in issues]))
+
+
+def columns_records(issues):
+    return (jira_time.parse_times([issue.created for issue in issues]),
+            jira_time.parse_times([issue.resolved for issue in issues]))
+
+
+def best_of(fn, arg, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(arg)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, nargs="+", default=[10000, 100000])
+    args = parser.parse_args()
+
+    print(f"{'issues':>7} {'dict B':>7} {'record B':>9} {'decode ns':>10} "
+          f"{'board dict':>11} {'board rec':>10} {'graph dict':>11} {'graph rec':>10}   (ns/issue)")
+    for n in args.n:
+        payload = jira_payload(n)
+        dict_bytes, issues = held_bytes(lambda: json.loads(payload)["issues"])
+        record_bytes, records = held_bytes(
+            lambda: [issue_record.from_issue(issue) for issue in json.loads(payload)["issues"]])
+        decode_s, _ = best_of(lambda items: [issue_record.from_issue(issue) for issue in items], issues)
+
+        board_dict_s, expected = best_of(tally_dicts, issues)
+        board_record_s, found = best_of(tally_records, records)
+        assert found == expected, "tallies disagree"
+        graph_dict_s, _ = best_of(columns_dicts, issues)
+        graph_record_s, _ = best_of(columns_records, records)
+
+        per = 1e9 / n
+        print(f"{n:>7} {dict_bytes / n:>7.0f} {record_bytes / n:>9.0f} {decode_s * per:>10.0f} "
+              f"{board_dict_s * per:>11.0f} {board_record_s * per:>10.0f} "
+              f"{graph_dict_s * per:>11.0f} {graph_record_s * per:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Benchmark: serial startAt loop vs concurrent page fetcher.
+
+Runs both against a local stub Jira with a fixed per-request latency and
+prints wall time as the number of pages grows.
+
+    python bench_jira_fetch.py [--latency 0.05] [--workers 8] [--fail-rate 0.0]
+"""
+import argparse
+import time
+
+import requests
+
+import jira_fetch
+from jira_stub import PROJECTS, JiraStub
+
+FIELDS = "issuetype,status,priority"
+JQL = "project=ALPHA"
+
+
+def fetch_serial(jira_url, jql):
+    """The original one-page-at-a-time loop from board2.py."""
+    url = f"{jira_url}/rest/api/2/search"
+    start_at = 0
+    max_results = 100
+    all_issues = []
+    while True:
+        params = {"jql": jql, "startAt": start_at, "maxResults": max_results, "fields": FIELDS}
+        response = requests.get(url, params=params)
+        if response.status_code != 200:
+            break
+        data = response.json()
+        all_issues.extend(data.get("issues", []))
+        if start_at + max_results >= data.get("total", 0):
+            break
+        start_at += max_results
+    return all_issues
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--workers", type=int, default=jira_fetch.MAX_WORKERS)
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 5, 10, 25, 50, 100])
+    args = parser.parse_args()
+
+    print(f"latency={args.latency}s workers={args.workers} fail_rate={args.fail_rate}")
+    print(f"{'pages':>6} {'serial s':>10} {'concurrent s':>13} {'speedup':>8}")
+    for pages in args.pages:
+        # JQL matches one project in len(PROJECTS), so size the stub for `pages` matching pages
+        with JiraStub(total=pages * 100 * len(PROJECTS), latency=args.latency) as stub:
+            serial_s, serial = timed(lambda: fetch_serial(stub.url, JQL))
+            stub.fail_rate = args.fail_rate
+            concurrent_s, concurrent = timed(lambda: jira_fetch.fetch_all_issues(
+                stub.url, None, JQL, FIELDS, max_workers=args.workers))
+        assert len(serial) == pages * 100, "stub sized for the wrong page count"
+        assert [i["key"] for i in concurrent] == [i["key"] for i in serial], "page order mismatch"
+        print(f"{pages:>6} {serial_s:>10.3f} {concurrent_s:>13.3f} {serial_s / concurrent_s:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
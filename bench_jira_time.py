@@ -0,0 +1,72 @@
+"""Microbenchmark: the Jira timestamp parsers the graph routes used vs jira_time.
+
+Decodes N synthetic Jira timestamps (mixed UTC offsets) to epoch seconds
+and reports ns per value for:
+
+  isoparse        dateutil.parser.isoparse (graph3.py)
+  fromisoformat   datetime.fromisoformat after .replace("Z", "+00:00") (graph2.py)
+  strptime        datetime.strptime with %z (issue_store.py)
+  strptime[:10]   datetime.strptime on the date slice only (graph.py; date, not instant)
+  to_epoch        jira_time.to_epoch, one value at a time
+  epochs          jira_time.epochs, the whole column at once
+
+    python bench_jira_time.py [--n 10000 100000]
+"""
+import argparse
+import random
+import time
+from datetime import datetime
+
+import numpy as np
+from dateutil import parser
+
+import jira_time
+
+
+def synthetic_timestamps(n, seed=0):
+    rng = random.Random(seed)
+    offsets = ["+0000"] * 6 + ["+0530", "-0500", "+0100", "-0800"]
+    return [f"{rng.randrange(2019, 2026)}-{rng.randrange(1, 13):02d}-{rng.randrange(1, 29):02d}"
+            f"T{rng.randrange(24):02d}:{rng.randrange(60):02d}:{rng.randrange(60):02d}"
+            f".{rng.randrange(1000):03d}{rng.choice(offsets)}" for _ in range(n)]
+
+
+PARSERS = {
+    "isoparse": lambda values: [parser.isoparse(v).timestamp() for v in values],
+    "fromisoformat": lambda values: [datetime.fromisoformat(v.replace("Z", "+00:00")).timestamp() for v in values],
+    "strptime": lambda values: [datetime.strptime(v, "%Y-%m-%dT%H:%M:%S.%f%z").timestamp() for v in values],
+    "strptime[:10]": lambda values: [datetime.strptime(v[:10], "%Y-%m-%d") for v in values],
+    "to_epoch": lambda values: [jira_time.to_epoch(v) for v in values],
+    "epochs": jira_time.epochs,
+}
+
+
+def best_of(fn, values, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(values)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--n", type=int, nargs="+", default=[10000, 100000])
+    args = arg_parser.parse_args()
+
+    print(f"{'values':>8} " + " ".join(f"{name:>14}" for name in PARSERS) + "   (ns/value)")
+    for n in args.n:
+        values = synthetic_timestamps(n)
+        expected = np.array(PARSERS["strptime"](values))
+        timings = []
+        for name, fn in PARSERS.items():
+            seconds, result = best_of(fn, values)
+            if name != "strptime[:10]":
+                assert np.allclose(np.asarray(result, dtype=float), expected, rtol=0, atol=1e-6), name
+            timings.append(seconds / n * 1e9)
+        print(f"{n:>8} " + " ".join(f"{ns:>14.0f}" for ns in timings))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Benchmark: final.py's original normalize_content_format vs doc_text.
+
+Builds synthetic page text (CRLF line endings, indentation and column gaps
+of 4+ spaces) and reports input MB/s for:
+
+  original   join pages, str.replace, then an uncompiled re.sub, then strip
+  joined     join pages, then doc_text.normalize (str.replace + precompiled regex)
+  streamed   doc_text.iter_normalized over the pages, never joining the input
+
+    python bench_normalize.py [--mb 16 64] [--page-kb 4]
+"""
+import argparse
+import random
+import re
+import time
+
+import doc_text
+
+
+def original(pages):
+    text = "".join(pages)
+    text = text.replace("\r\n", "\n")
+    text = re.sub(r'[ ]{4,}', '\n', text)
+    return text.strip()
+
+
+def joined(pages):
+    return doc_text.normalize("".join(pages))
+
+
+def streamed(pages):
+    return "".join(doc_text.iter_normalized(pages))
+
+
+def synthetic_pages(total_mb, page_kb, seed=0):
+    rng = random.Random(seed)
+    words = ["invoice", "total", "section", "clause", "amount", "the", "of", "and", "2025", "PO-1182"]
+    lines = []
+    for _ in range(2000):
+        parts = [" ".join(rng.choice(words) for _ in range(rng.randrange(2, 9)))
+                 for _ in range(rng.randrange(1, 4))]
+        gap = " " * rng.choice([1, 2, 4, 6, 12])
+        lines.append(" " * rng.choice([0, 0, 4]) + gap.join(parts) + "\r\n")
+    pages, size, target = [], 0, total_mb * 1024 * 1024
+    while size < target:
+        page = "".join(rng.choice(lines) for _ in range(page_kb * 1024 // 50))
+        pages.append(page)
+        size += len(page)
+    return pages, size
+
+
+def best_of(fn, pages, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(pages)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--mb", type=int, nargs="+", default=[16, 64])
+    parser.add_argument("--page-kb", type=int, default=4)
+    args = parser.parse_args()
+
+    print(f"{'MB':>5} {'pages':>7} {'original MB/s':>14} {'joined MB/s':>12} {'streamed MB/s':>14}")
+    for total_mb in args.mb:
+        pages, size = synthetic_pages(total_mb, args.page_kb)
+        mb = size / 1024 / 1024
+        original_s, expected = best_of(original, pages)
+        joined_s, found_joined = best_of(joined, pages)
+        streamed_s, found_streamed = best_of(streamed, pages)
+        assert found_joined == expected and found_streamed == expected, "normalizers disagree"
+        print(f"{mb:>5.0f} {len(pages):>7} {mb / original_s:>14.0f} {mb / joined_s:>12.0f} {mb / streamed_s:>14.0f}")
+
+
+if __name__ == "__main__":
+    main()
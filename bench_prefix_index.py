@@ -0,0 +1,67 @@
+"""Microbenchmark: nested startswith loop vs PrefixIndex lookups.
+
+Scales both the number of blobs in the tree and the number of requested
+base names, and checks both approaches return the same files.
+
+    python bench_prefix_index.py [--files 1000 10000 50000] [--names 10 100 500]
+"""
+import argparse
+import os
+import random
+import time
+
+from prefix_index import PrefixIndex
+
+
+def synthetic_tree(file_count, seed=0):
+    rng = random.Random(seed)
+    stems = [f"doc{n:05d}" for n in range(max(1, file_count // 4))]
+    return [{
+        "path": f"area{rng.randrange(20)}/{rng.choice(stems)}_{n}{rng.choice(['.pdf', '.docx', '.txt'])}",
+        "type": "blob"
+    } for n in range(file_count)], stems
+
+
+def nested_loop(items, base_names):
+    """The original git3 get_relevant_files matching."""
+    matched = []
+    for position, item in enumerate(items):
+        if item["type"] == "blob":
+            filename = os.path.basename(item["path"])
+            for base in base_names:
+                if filename.startswith(base + "_"):
+                    matched.append(position)
+                    break
+    return matched
+
+
+def timed(fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, nargs="+", default=[1_000, 10_000, 50_000])
+    parser.add_argument("--names", type=int, nargs="+", default=[10, 100, 500])
+    args = parser.parse_args()
+
+    print(f"{'files':>7} {'names':>6} {'loop ms':>9} {'index ms':>9} {'build ms':>9} {'speedup':>8}")
+    for file_count in args.files:
+        items, stems = synthetic_tree(file_count)
+        build_s, index = timed(lambda: PrefixIndex(items), repeat=1)
+        for name_count in args.names:
+            base_names = random.Random(name_count).sample(stems, min(name_count, len(stems)))
+            loop_s, expected = timed(lambda: nested_loop(items, base_names))
+            index_s, found = timed(lambda: index.matches_any(base + "_" for base in base_names))
+            assert found == expected, "index and loop disagree"
+            print(f"{file_count:>7} {name_count:>6} {loop_s * 1000:>9.2f} {index_s * 1000:>9.3f} "
+                  f"{build_s * 1000:>9.1f} {loop_s / index_s:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
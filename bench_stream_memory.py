@@ -0,0 +1,76 @@
+"""Benchmark: peak RSS of streamed vs materialized dashboard aggregation.
+
+Each run happens in a fresh child process so ru_maxrss is that run's peak.
+Search pages are synthesized in-process (no HTTP) so only the aggregation
+pipeline is measured.
+
+    python bench_stream_memory.py [--sizes 10000 100000 1000000] [--list-max 100000]
+"""
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import time
+from collections import Counter
+
+import jira_fetch
+from jira_stub import make_issue
+
+
+def synthetic_page(total):
+    def fetch_page(url, auth, jql, fields, start_at, max_results=jira_fetch.MAX_RESULTS, *args, **kwargs):
+        end = min(start_at + max_results, total)
+        return {"total": total, "issues": [make_issue(n) for n in range(start_at, end)]}
+    return fetch_page
+
+
+def run_child(mode, size):
+    jira_fetch.fetch_page = synthetic_page(size)
+    if mode == "list":
+        # The old shape: materialize every raw issue, then count
+        issues = jira_fetch.fetch_all_issues("http://stub", None, "", "issuetype,status,priority")
+        counts = Counter(issue["fields"]["status"]["name"] for issue in issues)
+    else:
+        os.environ.update(JIRA_URL="http://stub", JIRA_USER="", JIRA_TOKEN="")
+        os.environ.pop("JIRA_STORE", None)
+        import board5
+        response = board5.app.test_client().get("/jira-dashboard-all")
+        counts = response.get_json()["status_counts"]
+    assert sum(counts.values()) > 0
+    # ru_maxrss is KiB on Linux
+    print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024)
+
+
+def measure(mode, size):
+    start = time.perf_counter()
+    out = subprocess.run([sys.executable, __file__, "--child", mode, str(size)],
+                         capture_output=True, text=True, check=True).stdout
+    return float(out.strip().splitlines()[-1]), time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--list-max", type=int, default=100_000,
+                        help="largest size to run in materialized mode")
+    parser.add_argument("--child", nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child[0], int(args.child[1]))
+        return
+
+    print(f"{'issues':>9} {'stream MB':>10} {'stream s':>9} {'list MB':>9} {'list s':>8}")
+    for size in args.sizes:
+        stream_mb, stream_s = measure("stream", size)
+        if size <= args.list_max:
+            list_mb, list_s = measure("list", size)
+            listed = f"{list_mb:>9.1f} {list_s:>8.1f}"
+        else:
+            listed = f"{'skipped':>9} {'':>8}"
+        print(f"{size:>9} {stream_mb:>10.1f} {stream_s:>9.1f} {listed}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,10 @@
 from flask import Flask, jsonify
-import requests
 import os
 from dotenv import load_dotenv
+import issue_store
+import jira_counts
+import jira_fetch
+import response_cache
 from collections import Counter
 
 load_dotenv("board.env")
@@ -12,57 +15,72 @@ JIRA_URL = os.getenv("JIRA_URL")
 JIRA_USER = os.getenv("JIRA_USER")
 JIRA_TOKEN = os.getenv("JIRA_TOKEN")
 PROJECT_KEY = os.getenv("PROJECT_KEY")
+JIRA_STORE = os.getenv("JIRA_STORE")  # optional SQLite path for incremental sync
 
-def fetch_all_issues(jql):
-    """Fetch all issues for a JQL query (with pagination)."""
-    url = f"{JIRA_URL}/rest/api/2/search"
-    headers = {"Content-Type": "application/json"}
-    auth = (JIRA_USER, JIRA_TOKEN)
-
-    start_at = 0
-    max_results = 100
-    all_issues = []
-
-    while True:
-        params = {
-            "jql": jql,
-            "startAt": start_at,
-            "maxResults": max_results,
-            "fields": "issuetype,status,priority"
-        }
-        response = requests.get(url, headers=headers, params=params, auth=auth)
-        if response.status_code != 200:
-            print("Error:", response.text)
-            break
+# Count-only mode: ask Jira for per-status totals instead of downloading issues
+JIRA_COUNT_ONLY = os.getenv("JIRA_COUNT_ONLY", "").lower() in ("1", "true", "yes")
 
-        data = response.json()
-        issues = data.get("issues", [])
-        all_issues.extend(issues)
+URGENT_PRIORITIES = ["highest", "urgent", "p1"]
 
-        if start_at + max_results >= data.get("total", 0):
-            break
-        start_at += max_results
+STORE = issue_store.IssueStore(JIRA_STORE) if JIRA_STORE else None
 
-    return all_issues
+def iter_issues(jql):
+    """Stream issues for a JQL query as their pages arrive (pages fetched concurrently)."""
+    yield from jira_fetch.iter_records(
+        JIRA_URL, (JIRA_USER, JIRA_TOKEN), jql, "issuetype,status,priority",
+        headers={"Content-Type": "application/json"}
+    )
 
-@app.route("/jira-dashboard-task", methods=["GET"])
-def jira_dashboard_task():
-    # Fetch only "Task" issues from the project
-    issues = fetch_all_issues(f'project={PROJECT_KEY} AND issuetype="Task"')
+def iter_task_issues():
+    """Task issues for PROJECT_KEY, read from the local store when JIRA_STORE is set."""
+    if STORE is None:
+        yield from iter_issues(f'project={PROJECT_KEY} AND issuetype="Task"')
+        return
+    try:
+        STORE.sync(JIRA_URL, (JIRA_USER, JIRA_TOKEN), f"project={PROJECT_KEY}")
+    except Exception as e:
+        # Serve what is already stored rather than nothing
+        print("Error:", e)
+    yield from STORE.issues(project=PROJECT_KEY, issuetype="Task")
+
+@response_cache.cached("/jira-dashboard-task")
+def tally_task_issues():
+    """(status counts, urgent count) for PROJECT_KEY's Task issues, cached per route TTL.
+
+    Jira errors propagate, so a failed scan is never cached.
+    """
+    if JIRA_COUNT_ONLY:
+        jql = f'project={PROJECT_KEY} AND issuetype="Task"'
+        auth = (JIRA_USER, JIRA_TOKEN)
+        return (jira_counts.count_by_status(JIRA_URL, auth, jql),
+                jira_counts.count_priorities(JIRA_URL, auth, jql, URGENT_PRIORITIES))
 
-    total_tasks = len(issues)
     status_counter = Counter()
     urgent_count = 0
 
-    for issue in issues:
-        status_name = issue["fields"]["status"]["name"]
-        priority_name = issue["fields"]["priority"]["name"] if issue["fields"]["priority"] else ""
+    for issue in iter_task_issues():
+        status_name = issue.status
+        priority_name = issue.priority or ""
         
         status_counter[status_name] += 1
 
-        if priority_name.lower() in ["highest", "urgent", "p1"]:
+        if priority_name.lower() in URGENT_PRIORITIES:
             urgent_count += 1
 
+    return status_counter, urgent_count
+
+@app.route("/jira-dashboard-task", methods=["GET"])
+def jira_dashboard_task():
+    # Fetch only "Task" issues from the project
+    try:
+        status_counter, urgent_count = tally_task_issues()
+    except Exception as e:
+        # Jira unreachable: show empty counts without caching them
+        print("Error:", e)
+        status_counter, urgent_count = Counter(), 0
+
+    total_tasks = sum(status_counter.values())
+
     urgent_message = "Needs Immediate Attention" if urgent_count > 0 else "No urgent defects — all good!"
 
     return jsonify({
@@ -1,7 +1,9 @@
 from flask import Flask, jsonify
-import requests
 import os
 from dotenv import load_dotenv
+import issue_store
+import jira_fetch
+import response_cache
 from collections import Counter
 
 load_dotenv("board.env")
@@ -11,53 +13,40 @@ app = Flask(__name__)
 JIRA_URL = os.getenv("JIRA_URL")
 JIRA_USER = os.getenv("JIRA_USER")
 JIRA_TOKEN = os.getenv("JIRA_TOKEN")
-
-def fetch_all_issues(jql):
-    """Fetch all issues for a JQL query (pagination supported)."""
-    url = f"{JIRA_URL}/rest/api/2/search"
-    headers = {"Content-Type": "application/json"}
-    auth = (JIRA_USER, JIRA_TOKEN)
-
-    start_at = 0
-    max_results = 100
-    all_issues = []
-
-    while True:
-        params = {
-            "jql": jql,
-            "startAt": start_at,
-            "maxResults": max_results,
-            "fields": "issuetype,status,priority"
-        }
-        response = requests.get(url, headers=headers, params=params, auth=auth)
-        if response.status_code != 200:
-            print("Error:", response.text)
-            break
-
-        data = response.json()
-        issues = data.get("issues", [])
-        all_issues.extend(issues)
-
-        if start_at + max_results >= data.get("total", 0):
-            break
-        start_at += max_results
-
-    return all_issues
-
-
-@app.route("/jira-dashboard-all", methods=["GET"])
-def jira_dashboard_all():
-    # Fetch ALL issues across ALL projects
-    issues = fetch_all_issues("ORDER BY created DESC")
-
+JIRA_STORE = os.getenv("JIRA_STORE")  # optional SQLite path for incremental sync
+
+STORE = issue_store.IssueStore(JIRA_STORE) if JIRA_STORE else None
+
+def iter_issues(jql):
+    """Stream issues for a JQL query as their pages arrive (pages fetched concurrently)."""
+    yield from jira_fetch.iter_records(
+        JIRA_URL, (JIRA_USER, JIRA_TOKEN), jql, "issuetype,status,priority",
+        headers={"Content-Type": "application/json"}
+    )
+
+def iter_all_issues():
+    """Issues across all projects, read from the local store when JIRA_STORE is set."""
+    if STORE is None:
+        yield from iter_issues("ORDER BY created DESC")
+        return
+    try:
+        STORE.sync(JIRA_URL, (JIRA_USER, JIRA_TOKEN))
+    except Exception as e:
+        # Serve what is already stored rather than nothing
+        print("Error:", e)
+    yield from STORE.issues()
+
+
+def dashboard_payload(issues):
+    """The /jira-dashboard-all payload for an iterable of IssueRecords."""
     status_counter = Counter()
     urgent_count = 0
     test_case_status_counter = Counter()
 
     for issue in issues:
-        issue_type = issue["fields"]["issuetype"]["name"]
-        status_name = issue["fields"]["status"]["name"]
-        priority_name = issue["fields"]["priority"]["name"] if issue["fields"]["priority"] else ""
+        issue_type = issue.type
+        status_name = issue.status
+        priority_name = issue.priority or ""
 
         if issue_type.lower() != "test case":
             # Defects
@@ -87,7 +76,26 @@ def jira_dashboard_all():
         "test_case_statistics": test_case_statistics
     }
 
-    return jsonify(output)
+    return output
+
+
+@response_cache.cached("/jira-dashboard-all")
+def dashboard_all():
+    """The payload over ALL issues across ALL projects, cached per route TTL.
+
+    Jira errors propagate, so a failed scan is never cached.
+    """
+    return dashboard_payload(iter_all_issues())
+
+
+@app.route("/jira-dashboard-all", methods=["GET"])
+def jira_dashboard_all():
+    try:
+        return jsonify(dashboard_all())
+    except Exception as e:
+        # Jira unreachable: show empty counts without caching them
+        print("Error:", e)
+        return jsonify(dashboard_payload([]))
 
 
 if __name__ == "__main__":
@@ -1,14 +1,32 @@
 from flask import Flask, jsonify
-import requests
 import os
 from dotenv import load_dotenv
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+import http_client
+import issue_record
+import issue_store
+import jira_counts
+import jira_fetch
+import response_cache
 
 # Load Jira credentials
 load_dotenv("board.env")
 JIRA_URL = os.getenv("JIRA_URL")
 JIRA_USER = os.getenv("JIRA_USER")
 JIRA_TOKEN = os.getenv("JIRA_TOKEN")
+JIRA_STORE = os.getenv("JIRA_STORE")  # optional SQLite path for incremental sync
+
+# Concurrent project scans for /jira-summary
+JIRA_PROJECT_WORKERS = int(os.getenv("JIRA_PROJECT_WORKERS", "8"))
+# "per-project" pages each project separately; "cross-project" runs one search over all of them
+JIRA_SCAN_MODE = os.getenv("JIRA_SCAN_MODE", "per-project")
+# Count-only mode: ask Jira for per-status totals instead of downloading issues
+JIRA_COUNT_ONLY = os.getenv("JIRA_COUNT_ONLY", "").lower() in ("1", "true", "yes")
+
+URGENT_PRIORITIES = ["highest", "urgent", "p1", "high", "blocker"]
+
+STORE = issue_store.IssueStore(JIRA_STORE) if JIRA_STORE else None
 
 app = Flask(__name__)
 
@@ -17,58 +35,128 @@ def jira_get(endpoint, params=None):
     url = f"{JIRA_URL}/rest/api/2/{endpoint}"
     auth = (JIRA_USER, JIRA_TOKEN)
     headers = {"Content-Type": "application/json"}
-    response = requests.get(url, headers=headers, auth=auth, params=params)
+    response = http_client.jira_session(auth).get(url, headers=headers, params=params)
     if response.status_code != 200:
         raise Exception(f"Jira API Error {response.status_code}: {response.text}")
     return response.json()
 
-def get_all_project_data():
+def iter_project_issues(project_key):
+    """Yield every issue of one project, a page at a time."""
+    start_at = 0
+    max_results = 100
+    while True:
+        jql = f'project="{project_key}"'
+        issues_data = jira_get("search", {
+            "jql": jql,
+            "startAt": start_at,
+            "maxResults": max_results,
+            "fields": "issuetype,status,priority"
+        })
+        issues = issues_data.get("issues", [])
+        if not issues:
+            break
+
+        yield from map(issue_record.from_issue, issues)
+
+        if len(issues) < max_results:
+            break
+        start_at += max_results
+
+def iter_cross_project_issues():
+    """Yield every issue from a single search across all projects."""
+    yield from jira_fetch.iter_records(
+        JIRA_URL, (JIRA_USER, JIRA_TOKEN), "ORDER BY key ASC", "issuetype,status,priority",
+        headers={"Content-Type": "application/json"}
+    )
+
+def iter_stored_issues():
+    """Sync the local store, then yield every stored issue."""
+    try:
+        STORE.sync(JIRA_URL, (JIRA_USER, JIRA_TOKEN))
+    except Exception as e:
+        # Serve what is already stored rather than nothing
+        print("Error:", e)
+    yield from STORE.issues()
+
+def tally_issues(issues):
+    """Fold IssueRecords into (total, defect status counts, test case status counts, urgent count)."""
+    total_defects = 0
+    defect_status_counts = Counter()
+    test_case_status_counter = Counter()
+    urgent_defects_count = 0
+
+    for issue in issues:
+        total_defects += 1
+
+        issue_type = (issue.type or "").lower()
+        status_name = issue.status or "Unknown"
+        priority_name = (issue.priority or "").lower()
+
+        if issue_type != "test case":
+            # Count defect statuses
+            defect_status_counts[status_name] += 1
+
+            # Urgent defect check
+            if priority_name in URGENT_PRIORITIES:
+                urgent_defects_count += 1
+        else:
+            # Count test case statuses
+            test_case_status_counter[status_name] += 1
+
+    return total_defects, defect_status_counts, test_case_status_counter, urgent_defects_count
+
+def tally_all_projects():
+    """Scan every project concurrently and merge the per-project tallies."""
     # Get all project keys
     projects_data = jira_get("project")
     project_keys = [proj["key"] for proj in projects_data]
 
+    workers = max(1, min(JIRA_PROJECT_WORKERS, len(project_keys)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        partials = list(pool.map(lambda key: tally_issues(iter_project_issues(key)), project_keys))
+
+    # Merge in project order so the response is the same whichever scan finished first
     total_defects = 0
     defect_status_counts = Counter()
     test_case_status_counter = Counter()
     urgent_defects_count = 0
+    for total, defects, test_cases, urgent in partials:
+        total_defects += total
+        defect_status_counts.update(defects)
+        test_case_status_counter.update(test_cases)
+        urgent_defects_count += urgent
+
+    return total_defects, defect_status_counts, test_case_status_counter, urgent_defects_count
 
-    for project_key in project_keys:
-        start_at = 0
-        max_results = 100
-        while True:
-            jql = f'project="{project_key}"'
-            issues_data = jira_get("search", {
-                "jql": jql,
-                "startAt": start_at,
-                "maxResults": max_results,
-                "fields": "issuetype,status,priority"
-            })
-            issues = issues_data.get("issues", [])
-            if not issues:
-                break
-
-            total_defects += len(issues)
-
-            for issue in issues:
-                fields = issue.get("fields", {}) or {}
-                issue_type = (fields.get("issuetype") or {}).get("name", "").lower()
-                status_name = (fields.get("status") or {}).get("name", "Unknown")
-                priority_name = ((fields.get("priority") or {}).get("name", "")).lower()
-
-                if issue_type != "test case":
-                    # Count defect statuses
-                    defect_status_counts[status_name] += 1
-
-                    # Urgent defect check
-                    if priority_name in ["highest", "urgent", "p1", "high", "blocker"]:
-                        urgent_defects_count += 1
-                else:
-                    # Count test case statuses
-                    test_case_status_counter[status_name] += 1
-
-            if len(issues) < max_results:
-                break
-            start_at += max_results
+def count_all_projects():
+    """Same tally as tally_issues, built from count-only searches."""
+    auth = (JIRA_USER, JIRA_TOKEN)
+    status_counts = jira_counts.count_by_status(JIRA_URL, auth, "")
+
+    test_case = jira_counts.find_name(jira_counts.get_issue_types(JIRA_URL, auth), "test case")
+    if test_case:
+        test_case_jql = f"issuetype = {jira_counts.quote(test_case)}"
+        test_case_status_counter = jira_counts.count_by_status(JIRA_URL, auth, test_case_jql)
+        defect_jql = f"issuetype != {jira_counts.quote(test_case)}"
+    else:
+        test_case_status_counter = Counter()
+        defect_jql = ""
+
+    defect_status_counts = status_counts - test_case_status_counter
+    urgent_defects_count = jira_counts.count_priorities(JIRA_URL, auth, defect_jql, URGENT_PRIORITIES)
+    return sum(status_counts.values()), defect_status_counts, test_case_status_counter, urgent_defects_count
+
+@response_cache.cached("/jira-summary")
+def get_all_project_data():
+    if JIRA_COUNT_ONLY:
+        tally = count_all_projects()
+    elif STORE is not None:
+        tally = tally_issues(iter_stored_issues())
+    elif JIRA_SCAN_MODE == "cross-project":
+        tally = tally_issues(iter_cross_project_issues())
+    else:
+        tally = tally_all_projects()
+    total_defects, defect_status_counts, test_case_status_counter, urgent_defects_count = tally
 
     urgent_message = "Needs Immediate Attention" if urgent_defects_count > 0 else "No urgent defects"
 
@@ -0,0 +1,99 @@
+"""Incremental text readers for building document descriptions.
+
+A description is only the first line of a document, so these yield text a
+piece at a time (a page, a paragraph, a block of bytes) and let the caller
+stop as soon as the first line is complete. Listing cost then depends on
+where the first line is, not on how long the document is.
+"""
+import codecs
+import os
+import re
+
+# Bytes of a TXT file decoded while looking for its first line
+TXT_PREFIX_BYTES = int(os.getenv("TXT_PREFIX_BYTES", str(64 * 1024)))
+
+# Runs of 4+ spaces. Spelled as a literal prefix so re can scan ahead for
+# it; an alternation with \r\n (or [ ]{4,}) measured 2-4x slower.
+SPACE_RUNS = re.compile(r"    +")
+
+
+def iter_txt(content, limit=TXT_PREFIX_BYTES, chunk_size=4096):
+    """UTF-8 text of the first `limit` bytes of `content`, in chunks.
+
+    Raises UnicodeDecodeError on invalid UTF-8, like bytes.decode; a
+    multi-byte character cut by the limit is dropped.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    for start in range(0, min(len(content), limit), chunk_size):
+        end = min(start + chunk_size, limit)
+        yield decoder.decode(content[start:end], final=end >= len(content))
+
+
+def iter_txt_lines(content):
+    """Lines of a UTF-8 TXT file (line endings kept), decoded as they are read."""
+    pending = ""
+    for chunk in iter_txt(content, limit=len(content)):
+        lines = (pending + chunk).splitlines(keepends=True)
+        # The last line may continue (or end in "\r\n") in the next chunk
+        pending = lines.pop() if lines and not lines[-1].endswith("\n") else ""
+        yield from lines
+    if pending:
+        yield pending
+
+
+def iter_pdf_pages(doc, start=0, stop=None):
+    """Text of pages [start, stop); pages outside the window are never parsed."""
+    stop = doc.page_count if stop is None else min(stop, doc.page_count)
+    for number in range(start, stop):
+        yield doc.load_page(number).get_text()
+
+
+def iter_docx_lines(doc):
+    for paragraph in doc.paragraphs:
+        yield paragraph.text + "\n"
+
+
+def first_line(chunks, clean=str.strip):
+    """First line of `clean("".join(chunks))`, reading no more chunks than needed.
+
+    Once the cleaned text so far holds a newline with text after it, later
+    chunks can't change the first line, so reading stops there.
+    """
+    text = ""
+    for chunk in chunks:
+        text += chunk
+        cleaned = clean(text)
+        if "\n" in cleaned:
+            return cleaned.split("\n", 1)[0]
+    return clean(text).split("\n")[0]
+
+
+def breaks(text):
+    """final.py's content format: CRLF and runs of 4+ spaces become newlines."""
+    return SPACE_RUNS.sub("\n", text.replace("\r\n", "\n"))
+
+
+def normalize(text):
+    return breaks(text).strip()
+
+
+def iter_normalized(chunks):
+    """normalize("".join(chunks)), produced piece by piece as chunks arrive.
+
+    Each chunk is cut after its last non-whitespace character. Breaks are
+    made of whitespace only, so none can span a cut; the whitespace tail is
+    carried into the next chunk (and dropped at the end, like strip()).
+    """
+    carry = ""
+    started = False
+    for chunk in chunks:
+        text = carry + chunk
+        body = text.rstrip()
+        carry = text[len(body):]
+        if not body:
+            continue
+        piece = breaks(body)
+        if not started:
+            piece = piece.lstrip()
+            started = True
+        yield piece
@@ -0,0 +1,167 @@
+"""Download/parse pipeline for document listings.
+
+Downloads run on a thread pool, and each finished download is handed
+straight to a parse worker process, so network waits overlap with the
+CPU-bound PyMuPDF/python-docx work spread over every core. Results come
+back in input order.
+
+Each worker is a process of its own behind a pipe. A parse still running
+EXTRACT_TIMEOUT seconds after its worker picked it up is reported as
+TIMED_OUT (CRASHED if the worker died on it), and only that worker is
+killed and replaced on the spot, so the files queued behind it and other
+listings sharing the workers carry on. Workers come from a forkserver,
+not a fork of the (multithreaded) server process.
+At most `download_workers + workers` files are downloaded ahead of the
+caller, which keeps memory bounded when parsing falls behind.
+"""
+import multiprocessing
+import os
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+EXTRACT_WORKERS = int(os.getenv("EXTRACT_WORKERS", str(os.cpu_count() or 1)))
+DOWNLOAD_WORKERS = int(os.getenv("DOWNLOAD_WORKERS", "8"))
+# Seconds to wait for one file's parse before giving up on it
+EXTRACT_TIMEOUT = float(os.getenv("EXTRACT_TIMEOUT", "30"))
+
+TIMED_OUT = object()
+CRASHED = object()
+
+
+def serve(conn):
+    """Worker process loop: run (parse, args) requests and send back (ok, result)."""
+    while True:
+        try:
+            parse, args = conn.recv()
+        except EOFError:
+            return
+        try:
+            reply = (True, parse(*args))
+        except Exception as e:
+            reply = (False, e)
+        try:
+            conn.send(reply)
+        except Exception as e:
+            # The result or the error didn't pickle
+            conn.send((False, Exception(repr(e))))
+
+
+class Worker:
+    """One parse process, reached over a pipe."""
+
+    def __init__(self, context):
+        self.conn, child = context.Pipe()
+        self.process = context.Process(target=serve, args=(child,), daemon=True)
+        self.process.start()
+        child.close()
+
+    def kill(self):
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+class ExtractPool:
+    def __init__(self, workers=EXTRACT_WORKERS, download_workers=DOWNLOAD_WORKERS,
+                 timeout=EXTRACT_TIMEOUT):
+        self.workers = workers
+        self.download_workers = download_workers
+        self.timeout = timeout
+        # Forking a process whose other threads may hold locks can deadlock the child
+        self._context = multiprocessing.get_context("forkserver")
+        self._idle = queue.Queue()
+        self._workers = set()   # every live worker, idle or busy
+        self._started = False
+        self._lock = threading.Lock()
+
+    def _start(self):
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+        for _ in range(self.workers):
+            self._idle.put(self._spawn())
+
+    def _spawn(self):
+        worker = Worker(self._context)
+        with self._lock:
+            self._workers.add(worker)
+        return worker
+
+    def _retire(self, worker):
+        worker.kill()
+        with self._lock:
+            self._workers.discard(worker)
+
+    def run(self, parse, args):
+        """parse(*args) in a worker process, or TIMED_OUT / CRASHED.
+
+        Waits for a free worker first; the timeout only counts once the
+        parse has started. A worker that times out or dies is replaced.
+        """
+        self._start()
+        worker = self._idle.get()
+        try:
+            worker.conn.send((parse, args))
+            if not worker.conn.poll(self.timeout):
+                self._retire(worker)
+                worker = self._spawn()
+                return TIMED_OUT
+            ok, result = worker.conn.recv()
+        except (EOFError, OSError) as e:
+            # The worker crashed on this file (e.g. inside a C extension)
+            print("Error:", e)
+            self._retire(worker)
+            worker = self._spawn()
+            return CRASHED
+        finally:
+            with self._lock:
+                if self._started:
+                    self._idle.put(worker)
+                    worker = None
+            if worker is not None:
+                # The pool was closed while this file was parsing
+                self._retire(worker)
+        if not ok:
+            raise result
+        return result
+
+    def map(self, jobs, download, parse):
+        """Yield parse(*download(job)) for each job, in order.
+
+        `download` runs on a thread and returns the argument tuple for
+        `parse`, or None when there is nothing to parse (that job yields
+        None). `parse` runs in a worker process, so it must be a picklable
+        module-level function. A parse that runs too long yields TIMED_OUT,
+        one that crashes its worker yields CRASHED.
+        """
+        def work(job):
+            args = download(job)
+            return None if args is None else self.run(parse, args)
+
+        jobs = iter(jobs)
+        with ThreadPoolExecutor(max_workers=self.download_workers) as threads:
+            pending = deque(threads.submit(work, job)
+                            for job in islice(jobs, self.download_workers + self.workers))
+            while pending:
+                result = pending.popleft().result()
+                for job in islice(jobs, 1):
+                    pending.append(threads.submit(work, job))
+                yield result
+
+    def close(self):
+        """Kill every worker, including ones busy on a parse."""
+        with self._lock:
+            self._started = False
+            workers = list(self._workers)
+            self._workers.clear()
+            while True:
+                try:
+                    self._idle.get_nowait()
+                except queue.Empty:
+                    break
+        for worker in workers:
+            worker.kill()
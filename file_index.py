@@ -0,0 +1,154 @@
+"""Persistent basename -> (branch, path, blob SHA) index over every branch.
+
+A refresh lists the branches (one paginated call) and only re-reads the
+trees of branches whose head commit moved since the last refresh; rows
+for unchanged branches are left alone, and deleted branches are dropped.
+Lookups are an indexed SQLite query. The index is refreshed when it is
+older than FILE_INDEX_TTL seconds, or when a name isn't found; misses
+trigger at most one refresh per FILE_INDEX_MISS_INTERVAL seconds, so a
+burst of lookups for missing names doesn't turn into a burst of branch
+listings.
+
+When a basename exists on several branches, the branch listed first by
+GitHub wins, matching repo_files.crawl.
+"""
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+import requests
+
+import repo_files
+import tree_cache
+
+# Seconds a refresh is trusted before a lookup checks branch heads again
+FILE_INDEX_TTL = float(os.getenv("FILE_INDEX_TTL", "60"))
+# Minimum seconds between refreshes triggered by a name not being found
+FILE_INDEX_MISS_INTERVAL = float(os.getenv("FILE_INDEX_MISS_INTERVAL", "5"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS branches (
+    repo TEXT,
+    branch TEXT,
+    head TEXT,
+    position INTEGER,
+    PRIMARY KEY (repo, branch)
+);
+CREATE TABLE IF NOT EXISTS files (
+    repo TEXT,
+    branch TEXT,
+    basename TEXT,
+    path TEXT,
+    sha TEXT
+);
+CREATE INDEX IF NOT EXISTS files_basename ON files (repo, basename);
+CREATE INDEX IF NOT EXISTS files_branch ON files (repo, branch);
+"""
+
+
+class FileIndex:
+    def __init__(self, path, session, api_url, repo, wanted, ttl=FILE_INDEX_TTL,
+                 miss_interval=FILE_INDEX_MISS_INTERVAL):
+        self.path = path
+        self.session = session
+        self.api_url = api_url
+        self.repo = repo
+        self.wanted = wanted
+        self.ttl = ttl
+        self.miss_interval = miss_interval
+        self.refreshed = 0.0
+        self.miss_checked = 0.0
+        self._refresh_lock = threading.Lock()
+        self._miss_lock = threading.Lock()
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _fetch_tree(self, head):
+        try:
+            return tree_cache.TREES.get_tree_at(self.session, self.api_url, self.repo, head)
+        except requests.HTTPError:
+            return None
+
+    def refresh(self, force=False):
+        """Bring the index up to date with the current branch heads.
+
+        Unless `force`, does nothing if another caller refreshed within the
+        TTL while this one waited for the lock.
+        """
+        with self._refresh_lock:
+            if not force and time.time() - self.refreshed < self.ttl:
+                return
+            branches = repo_files.list_branches(self.session, self.api_url, self.repo)
+            if not branches:
+                # Listing failed (or the repo is empty); keep what we have
+                return
+            with self._connect() as conn:
+                stored = dict(conn.execute(
+                    "SELECT branch, head FROM branches WHERE repo = ?", (self.repo,)))
+            moved = [(name, head) for name, head in branches if stored.get(name) != head]
+            heads = list(dict.fromkeys(head for _, head in moved))
+            with ThreadPoolExecutor(max_workers=repo_files.BRANCH_WORKERS) as pool:
+                trees = dict(zip(heads, pool.map(self._fetch_tree, heads)))
+
+            listed = {name for name, _ in branches}
+            with self._connect() as conn:
+                for name in set(stored) - listed:
+                    conn.execute("DELETE FROM files WHERE repo = ? AND branch = ?", (self.repo, name))
+                    conn.execute("DELETE FROM branches WHERE repo = ? AND branch = ?", (self.repo, name))
+                for name, head in moved:
+                    tree = trees[head]
+                    if tree is None:
+                        continue  # retried on the next refresh
+                    conn.execute("DELETE FROM files WHERE repo = ? AND branch = ?", (self.repo, name))
+                    conn.executemany("INSERT INTO files VALUES (?, ?, ?, ?, ?)", [
+                        (self.repo, name, os.path.basename(item["path"]), item["path"], item["sha"])
+                        for item in tree.items
+                        if item["type"] == "blob" and self.wanted(item)
+                    ])
+                    conn.execute("INSERT OR REPLACE INTO branches VALUES (?, ?, ?, ?)",
+                                 (self.repo, name, head, 0))
+                conn.executemany("UPDATE branches SET position = ? WHERE repo = ? AND branch = ?",
+                                 [(position, self.repo, name) for position, (name, _) in enumerate(branches)])
+            self.refreshed = time.time()
+
+    def _lookup(self, basename):
+        with self._connect() as conn:
+            return conn.execute(
+                "SELECT files.path, files.sha, files.branch FROM files"
+                " JOIN branches ON branches.repo = files.repo AND branches.branch = files.branch"
+                " WHERE files.repo = ? AND files.basename = ?"
+                " ORDER BY branches.position, files.path LIMIT 1",
+                (self.repo, basename)).fetchone()
+
+    def _claim_miss_refresh(self):
+        """True for at most one miss per miss_interval since the last refresh or miss check."""
+        with self._miss_lock:
+            now = time.time()
+            if now - max(self.refreshed, self.miss_checked) < self.miss_interval:
+                return False
+            self.miss_checked = now
+            return True
+
+    def find(self, basename):
+        """RepoFile for `basename`, or None if no branch has it."""
+        fresh = time.time() - self.refreshed < self.ttl
+        if not fresh:
+            self.refresh()
+        row = self._lookup(basename)
+        if row is None and fresh and self._claim_miss_refresh():
+            # Maybe added since the last refresh
+            self.refresh(force=True)
+            row = self._lookup(basename)
+        return repo_files.RepoFile(*row) if row else None
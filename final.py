@@ -1,9 +1,17 @@
+import io
+import itertools
+import json
 import os
 import requests
-import base64
-import re
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context
 from dotenv import load_dotenv
+import http_client
+import doc_text
+import extract_pool
+import file_index
+import repo_files
+import search_index
+import text_cache
 import fitz  # PyMuPDF
 from docx import Document
 
@@ -14,103 +22,139 @@ app = Flask(__name__)
 GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
 GITHUB_REPO_OWNER = os.getenv("GITHUB_REPO_OWNER")
 GITHUB_REPO_NAME = os.getenv("GITHUB_REPO_NAME")
+GITHUB_API_URL = os.getenv("GITHUB_API_URL", "https://api.github.com")
 
 HEADERS = {
     "Authorization": f"token {GITHUB_TOKEN}"
 }
+GITHUB = http_client.github_session(HEADERS)
 
 VALID_EXTENSIONS = [".pdf", ".txt", ".docx"]
 
+TEXT_CACHE = text_cache.TextCache(os.getenv("TEXT_CACHE", "final_text_cache.db"))
+EXTRACTOR = extract_pool.ExtractPool()
+SEARCH = search_index.SearchIndex(os.getenv("SEARCH_INDEX", "final_search.db"))
+
 # --------------------------------------------------
 # Utility: Normalize content formatting
 # --------------------------------------------------
 def normalize_content_format(text):
-    text = text.replace("\r\n", "\n")  # Normalize line endings
-    text = re.sub(r'[ ]{4,}', '\n', text)  # Replace 4+ spaces with newlines
-    return text.strip()
+    # CRLF and runs of 4+ spaces become newlines, then strip
+    return doc_text.normalize(text)
+
+def normalize_parts(parts):
+    """normalize_content_format over text arriving page by page, never joined raw."""
+    return doc_text.iter_normalized(parts)
+
+def first_normalized_line(parts):
+    return doc_text.first_line(normalize_parts(parts), clean=lambda text: text)
 
 # --------------------------------------------------
 # GitHub Helpers
 # --------------------------------------------------
-def list_all_branches():
-    url = f"https://api.github.com/repos/{GITHUB_REPO_OWNER}/{GITHUB_REPO_NAME}/branches"
-    response = requests.get(url, headers=HEADERS)
-    if response.status_code != 200:
-        return []
-    return [branch["name"] for branch in response.json()]
-
-def fetch_files_from_branch(branch_name):
-    url = f"https://api.github.com/repos/{GITHUB_REPO_OWNER}/{GITHUB_REPO_NAME}/git/trees/{branch_name}?recursive=1"
-    response = requests.get(url, headers=HEADERS)
-    if response.status_code != 200:
-        return []
-    tree = response.json().get("tree", [])
-    return [
-        item["path"]
-        for item in tree
-        if item["type"] == "blob"
-        and os.path.splitext(item["path"])[1].lower() in VALID_EXTENSIONS
+def is_valid_file(item):
+    return (
+        os.path.splitext(item["path"])[1].lower() in VALID_EXTENSIONS
         and os.path.basename(item["path"]).lower() != "readme.md"
-    ]
+    )
 
 def fetch_all_valid_files():
-    branches = list_all_branches()
-    all_files = set()
-    for branch in branches:
-        files = fetch_files_from_branch(branch)
-        all_files.update(files)
-    return list(all_files)
-
-def get_file_content_from_github(file_path):
-    url = f"https://api.github.com/repos/{GITHUB_REPO_OWNER}/{GITHUB_REPO_NAME}/contents/{file_path}"
-    response = requests.get(url, headers=HEADERS)
-    if response.status_code != 200:
-        return None, response.status_code
-    content = base64.b64decode(response.json()["content"])
+    """Valid files across all branches as RepoFile(path, sha, branch), one per blob."""
+    return repo_files.crawl(
+        GITHUB, GITHUB_API_URL, f"{GITHUB_REPO_OWNER}/{GITHUB_REPO_NAME}", is_valid_file)
+
+FILES = file_index.FileIndex(os.getenv("FILE_INDEX", "final_file_index.db"), GITHUB, GITHUB_API_URL,
+                             f"{GITHUB_REPO_OWNER}/{GITHUB_REPO_NAME}", is_valid_file)
+
+def get_file_content_from_github(repo_file):
+    try:
+        content = repo_files.download_blob(
+            GITHUB, GITHUB_API_URL, f"{GITHUB_REPO_OWNER}/{GITHUB_REPO_NAME}", repo_file.sha)
+    except requests.HTTPError as e:
+        return None, e.response.status_code
+    except Exception as e:
+        print("Error:", e)
+        return None, 502
     return content, 200
 
+def download_for_extraction(repo_file):
+    """(content, ext) for extract_description, or None if the download failed."""
+    content, status = get_file_content_from_github(repo_file)
+    if not content:
+        return None
+    return content, os.path.splitext(repo_file.path)[1].lower()
+
 # --------------------------------------------------
 # Content Parsing
 # --------------------------------------------------
 def extract_description(content, ext):
     try:
+        # Read only until the first line is complete
         if ext == ".txt":
-            text = content.decode()
-            return normalize_content_format(text).split("\n")[0]
+            return first_normalized_line(doc_text.iter_txt(content))
         elif ext == ".pdf":
             doc = fitz.open(stream=content, filetype="pdf")
-            text = "".join([page.get_text() for page in doc])
-            return normalize_content_format(text).split("\n")[0]
+            return first_normalized_line(doc_text.iter_pdf_pages(doc))
         elif ext == ".docx":
-            with open("temp.docx", "wb") as f:
-                f.write(content)
-            doc = Document("temp.docx")
-            text = "\n".join(p.text for p in doc.paragraphs)
-            return normalize_content_format(text).split("\n")[0]
+            doc = Document(io.BytesIO(content))
+            return first_normalized_line(doc_text.iter_docx_lines(doc))
         else:
             return "Unsupported file"
     except Exception as e:
         return f"Error: {str(e)}"
 
+def extract_text(content, ext):
+    """Normalized full text of a document, or None for an unsupported type."""
+    if ext == ".txt":
+        parts = doc_text.iter_txt(content, limit=len(content))
+    elif ext == ".pdf":
+        parts = doc_text.iter_pdf_pages(fitz.open(stream=content, filetype="pdf"))
+    elif ext == ".docx":
+        parts = doc_text.iter_docx_lines(Document(io.BytesIO(content)))
+    else:
+        return None
+    return "".join(normalize_parts(parts))
+
+def iter_parts(content, ext, offset=0, limit=None):
+    """Text of each PDF page, DOCX paragraph or TXT line, from part `offset` on."""
+    stop = None if limit is None else offset + limit
+    if ext == ".pdf":
+        doc = fitz.open(stream=content, filetype="pdf")
+        return doc_text.iter_pdf_pages(doc, offset, stop)
+    elif ext == ".docx":
+        doc = Document(io.BytesIO(content))
+        return itertools.islice((p.text for p in doc.paragraphs), offset, stop)
+    elif ext == ".txt":
+        return itertools.islice(doc_text.iter_txt_lines(content), offset, stop)
+    return None
+
 # --------------------------------------------------
 # API 1: Get all files with descriptions
 # --------------------------------------------------
 @app.route("/get-all-files", methods=["GET"])
 def get_all_files():
     files = fetch_all_valid_files()
-    output = []
+    descriptions = TEXT_CACHE.get_many([f.sha for f in files], "description")
 
-    for file_path in files:
-        file_name = os.path.basename(file_path)
-        ext = os.path.splitext(file_name)[1].lower()
-        content, status = get_file_content_from_github(file_path)
-        if content:
-            desc = extract_description(content, ext)
-        else:
+    # Download and parse only the blobs not seen before, across worker processes
+    missing = [f for f in repo_files.distinct_blobs(files) if f.sha not in descriptions]
+    parsed = EXTRACTOR.map(missing, download_for_extraction, extract_description)
+    for repo_file, desc in zip(missing, parsed):
+        if desc is None:
             desc = "Unable to fetch"
+        elif desc is extract_pool.TIMED_OUT:
+            desc = "Error: timed out"
+        elif desc is extract_pool.CRASHED:
+            desc = "Error: parser crashed"
+        else:
+            TEXT_CACHE.put(repo_file.sha, "description", desc)
+        descriptions[repo_file.sha] = desc
+
+    output = []
+    for repo_file in files:
         output.append({
-            "file_name": file_name,
-            "description": desc
+            "file_name": os.path.basename(repo_file.path),
+            "description": descriptions[repo_file.sha]
         })
 
     return jsonify(output)
@@ -125,38 +169,77 @@ def get_file_content():
     if not filename:
         return jsonify({"error": "file_name is required"}), 400
 
-    files = fetch_all_valid_files()
-    match = next((f for f in files if os.path.basename(f) == filename), None)
+    match = FILES.find(filename)
 
     if not match:
         return jsonify({"error": "File not found"}), 404
 
-    ext = os.path.splitext(filename)[1].lower()
-    content, status = get_file_content_from_github(match)
-    if status != 200 or content is None:
-        return jsonify({"error": "Could not fetch file"}), 500
+    if data.get("stream"):
+        return stream_file_content(match, data)
 
-    if ext == ".txt":
-        text = content.decode()
-        normalized = normalize_content_format(text)
-    elif ext == ".pdf":
-        doc = fitz.open(stream=content, filetype="pdf")
-        text = "".join([page.get_text() for page in doc])
-        normalized = normalize_content_format(text)
-    elif ext == ".docx":
-        with open("temp.docx", "wb") as f:
-            f.write(content)
-        doc = Document("temp.docx")
-        text = "\n".join(p.text for p in doc.paragraphs)
-        normalized = normalize_content_format(text)
-    else:
-        return jsonify({"error": "Unsupported file type"}), 400
+    normalized = TEXT_CACHE.get(match.sha, "text")
+    if normalized is None:
+        ext = os.path.splitext(filename)[1].lower()
+        content, status = get_file_content_from_github(match)
+        if status != 200 or content is None:
+            return jsonify({"error": "Could not fetch file"}), 500
+        normalized = extract_text(content, ext)
+        if normalized is None:
+            return jsonify({"error": "Unsupported file type"}), 400
+        TEXT_CACHE.put(match.sha, "text", normalized)
 
     return jsonify({
         "file_name": filename,
         "content": normalized
     })
 
+def stream_file_content(match, data):
+    """NDJSON, one {"part", "content"} line per page/paragraph/line, sent as it is parsed.
+
+    `offset` and `limit` (in parts) select a window so clients can page
+    through a large document. Each part is normalized on its own.
+    """
+    try:
+        offset = int(data.get("offset", 0))
+        limit = None if data.get("limit") is None else int(data["limit"])
+    except (TypeError, ValueError):
+        return jsonify({"error": "offset and limit must be integers"}), 400
+    if offset < 0 or (limit is not None and limit < 0):
+        return jsonify({"error": "offset and limit must not be negative"}), 400
+
+    content, status = get_file_content_from_github(match)
+    if status != 200 or content is None:
+        return jsonify({"error": "Could not fetch file"}), 500
+    parts = iter_parts(content, os.path.splitext(match.path)[1].lower(), offset, limit)
+    if parts is None:
+        return jsonify({"error": "Unsupported file type"}), 400
+
+    def generate():
+        for number, text in enumerate(parts, start=offset):
+            yield json.dumps({"part": number, "content": normalize_content_format(text)}) + "\n"
+
+    return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+
+# --------------------------------------------------
+# API 3: Full-text search over document contents
+# --------------------------------------------------
+
+def extract_searchable_text(content, ext):
+    """extract_text for the search index; a document that fails to parse is indexed as empty."""
+    try:
+        return extract_text(content, ext) or ""
+    except Exception as e:
+        print("Error:", e)
+        return ""
+
+DOCUMENT_SEARCH = search_index.DocumentSearch(SEARCH, fetch_all_valid_files, TEXT_CACHE, EXTRACTOR,
+                                              download_for_extraction, extract_searchable_text)
+
+@app.route("/search", methods=["GET"])
+def search_files():
+    payload, status = DOCUMENT_SEARCH.respond(request.args)
+    return jsonify(payload), status
+
 # --------------------------------------------------
 # Run Server
 # --------------------------------------------------
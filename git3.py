@@ -1,7 +1,9 @@
 import os
-import requests
 from flask import Flask, request, jsonify
 from dotenv import load_dotenv
+import http_client
+import prefix_index
+import tree_cache
 
 # Load .env values
 load_dotenv("git3.env")
@@ -11,20 +13,22 @@ GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
 GITHUB_REPO_OWNER = os.getenv("GITHUB_REPO_OWNER")
 GITHUB_REPO_NAME = os.getenv("GITHUB_REPO_NAME")
 BRANCH = os.getenv("BRANCH", "main")
+GITHUB_API_URL = os.getenv("GITHUB_API_URL", "https://api.github.com")
 
 # Global headers for GitHub API
 HEADERS = {
     "Authorization": f"Bearer {GITHUB_TOKEN}",
     "Accept": "application/vnd.github+json"
 }
+GITHUB = http_client.github_session(HEADERS)
 
 app = Flask(__name__)
 
 # --- Get Latest Commit Message for File ---
 def get_latest_commit_message(file_path):
-    url = f"https://api.github.com/repos/{GITHUB_REPO_OWNER}/{GITHUB_REPO_NAME}/commits"
+    url = f"{GITHUB_API_URL}/repos/{GITHUB_REPO_OWNER}/{GITHUB_REPO_NAME}/commits"
     params = {"path": file_path, "sha": BRANCH}
-    response = requests.get(url, headers=HEADERS, params=params)
+    response = GITHUB.get(url, params=params)
     if response.status_code == 200:
         commits = response.json()
         if commits:
@@ -45,25 +49,21 @@ def get_relevant_files():
     data = request.get_json()
     base_names = [os.path.splitext(name)[0] for name in data.get("file_names", [])]
 
-    GITHUB_API_URL = f"https://api.github.com/repos/{GITHUB_REPO_OWNER}/{GITHUB_REPO_NAME}/git/trees/{BRANCH}?recursive=1"
-
     try:
-        res = requests.get(GITHUB_API_URL, headers=HEADERS)
-        res.raise_for_status()
-        files = res.json().get("tree", [])
+        tree = tree_cache.TREES.get_tree(
+            GITHUB, GITHUB_API_URL, f"{GITHUB_REPO_OWNER}/{GITHUB_REPO_NAME}", BRANCH)
+        files = tree.items
+        # Sorted basename index, built once per tree version
+        index = tree_cache.TREES.derive(tree, "basenames", lambda t: prefix_index.PrefixIndex(t.items))
 
         relevant_files = []
-        for item in files:
-            if item["type"] == "blob":
-                filename = os.path.basename(item["path"])
-                for base in base_names:
-                    if filename.startswith(base + "_"):
-                        commit_msg = get_latest_commit_message(item["path"])
-                        relevant_files.append({
-                            "file_name": filename,
-                            "description": commit_msg
-                        })
-                        break
+        for position in index.matches_any(base + "_" for base in base_names):
+            item = files[position]
+            commit_msg = get_latest_commit_message(item["path"])
+            relevant_files.append({
+                "file_name": os.path.basename(item["path"]),
+                "description": commit_msg
+            })
 
         return jsonify(relevant_files)
     except Exception as e:
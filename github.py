@@ -1,7 +1,10 @@
 from flask import Flask, request, jsonify
-import requests
 import os
+import requests
 from dotenv import load_dotenv
+import github_history
+import http_client
+import tree_cache
 
 app = Flask(__name__)
 load_dotenv("github.env")
@@ -9,26 +12,45 @@ load_dotenv("github.env")
 GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
 GITHUB_REPO = os.getenv("GITHUB_REPO")
 GITHUB_BRANCH = os.getenv("GITHUB_BRANCH", "main")
+GITHUB_API_URL = os.getenv("GITHUB_API_URL", "https://api.github.com")
 
 HEADERS = {"Authorization": f"Bearer {GITHUB_TOKEN}"}
+GITHUB = http_client.github_session(HEADERS)
+
+
+def describe_commit(full_msg):
+    if not full_msg:
+        return "No commit message found"
+    parts = full_msg.strip().split("\n\n", 1)  # Split title and body
+    if len(parts) > 1:
+        return parts[1].strip()  # Only the description
+    else:
+        return parts[0].strip()  # Fallback to full message if no body
 
 
 def get_commit_message(repo, file_path):
-    commits_url = f"https://api.github.com/repos/{repo}/commits"
+    commits_url = f"{GITHUB_API_URL}/repos/{repo}/commits"
     params = {"path": file_path, "per_page": 1}
-    res = requests.get(commits_url, headers=HEADERS, params=params)
+    res = GITHUB.get(commits_url, params=params)
 
     if res.status_code == 200 and res.json():
-        full_msg = res.json()[0]["commit"]["message"]
-        parts = full_msg.strip().split("\n\n", 1)  # Split title and body
-        if len(parts) > 1:
-            return parts[1].strip()  # Only the description
-        else:
-            return parts[0].strip()  # Fallback to full message if no body
+        return describe_commit(res.json()[0]["commit"]["message"])
     else:
         return "No commit message found"
 
 
+def get_commit_messages(repo, file_paths):
+    """Descriptions for many files, batched through GraphQL when it is available."""
+    try:
+        # Default branch, like the REST /commits fallback
+        messages = github_history.latest_commit_messages(
+            GITHUB, GITHUB_API_URL, repo, None, file_paths)
+    except Exception as e:
+        print("GraphQL lookup failed, falling back to REST:", e)
+        return {path: get_commit_message(repo, path) for path in file_paths}
+    return {path: describe_commit(messages.get(path)) for path in file_paths}
+
+
 @app.route("/get_related_docs", methods=["POST"])
 def get_related_docs():
     data = request.get_json()
@@ -40,13 +62,13 @@ def get_related_docs():
     base_name = os.path.splitext(file_name)[0].lower()
     valid_exts = [".docx", ".pdf", ".txt", ".xlsx"]
 
-    tree_url = f"https://api.github.com/repos/{GITHUB_REPO}/git/trees/{GITHUB_BRANCH}?recursive=1"
-    response = requests.get(tree_url, headers=HEADERS)
-    if response.status_code != 200:
-        return jsonify({"error": "Failed to fetch repo tree", "details": response.json()}), 500
+    try:
+        tree = tree_cache.TREES.get_tree(GITHUB, GITHUB_API_URL, GITHUB_REPO, GITHUB_BRANCH)
+    except requests.HTTPError as e:
+        return jsonify({"error": "Failed to fetch repo tree", "details": e.response.json()}), 500
 
-    files = response.json().get("tree", [])
-    matched_files = []
+    files = tree.items
+    matched_paths = []
 
     for file in files:
         if file["type"] != "blob":
@@ -57,12 +79,13 @@ def get_related_docs():
         ext = os.path.splitext(filename)[1].lower()
 
         if filename.lower().startswith(base_name + "_") and ext in valid_exts:
-            description = get_commit_message(GITHUB_REPO, filepath)
+            matched_paths.append(filepath)
 
-            matched_files.append({
-                "file_name": filename,
-                "description": description
-            })
+    descriptions = get_commit_messages(GITHUB_REPO, matched_paths)
+    matched_files = [{
+        "file_name": os.path.basename(filepath),
+        "description": descriptions[filepath]
+    } for filepath in matched_paths]
 
     if not matched_files:
         return jsonify({"message": "No related files found"}), 404
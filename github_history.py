@@ -0,0 +1,66 @@
+"""Bulk "latest commit touching this path" lookups via GitHub GraphQL.
+
+One query carries up to GRAPHQL_BATCH aliased `history(first: 1, path: ...)`
+fields, replacing one REST `/commits?path=` call per file. Without a ref the
+history is read from the repository's default branch, as `/commits` does.
+"""
+
+# Aliased history fields per query; keeps each query well inside GitHub's node limits
+GRAPHQL_BATCH = 50
+
+
+def build_query(count, ref=True):
+    """History query for `count` paths, at $ref or (ref=False) the default branch."""
+    params = "".join(f", $p{n}: String!" for n in range(count))
+    fields = "\n".join(f"f{n}: history(first: 1, path: $p{n}) {{ nodes {{ message }} }}"
+                       for n in range(count))
+    if ref:
+        params = ", $ref: String!" + params
+        target = "    object(expression: $ref) {\n"
+    else:
+        target = "    defaultBranchRef { target {\n"
+    return (
+        f"query($owner: String!, $name: String!{params}) {{\n"
+        "  repository(owner: $owner, name: $name) {\n"
+        f"{target}"
+        f"      ... on Commit {{\n{fields}\n      }}\n"
+        f"    }}{'' if ref else ' }'}\n"
+        "  }\n"
+        "}"
+    )
+
+
+def latest_commit_messages(session, api_url, repo, ref, paths, batch_size=GRAPHQL_BATCH):
+    """Map each path to the full message of the latest commit on `ref` that touched it.
+
+    With ref=None the default branch is used.
+
+    Paths with no history map to None. Raises if the GraphQL API is unavailable
+    so callers can fall back to per-file REST lookups.
+    """
+    owner, name = repo.split("/", 1)
+    messages = {}
+    for start in range(0, len(paths), batch_size):
+        batch = paths[start:start + batch_size]
+        variables = {"owner": owner, "name": name}
+        if ref is not None:
+            variables["ref"] = ref
+        variables.update({f"p{n}": path for n, path in enumerate(batch)})
+
+        response = session.post(f"{api_url}/graphql",
+                                json={"query": build_query(len(batch), ref is not None), "variables": variables})
+        if response.status_code != 200:
+            raise Exception(f"GitHub GraphQL error {response.status_code}: {response.text}")
+        body = response.json()
+        repository = (body.get("data") or {}).get("repository") or {}
+        if ref is None:
+            commit = (repository.get("defaultBranchRef") or {}).get("target")
+        else:
+            commit = repository.get("object")
+        if commit is None:
+            raise Exception(f"GitHub GraphQL error: {body.get('errors')}")
+
+        for n, path in enumerate(batch):
+            nodes = (commit.get(f"f{n}") or {}).get("nodes") or []
+            messages[path] = nodes[0]["message"] if nodes else None
+    return messages
@@ -0,0 +1,215 @@
+"""Local stand-in for the parts of the GitHub API these apps call.
+
+Serves an in-memory repository (branch -> {path: bytes}) through the REST
+endpoints used by github.py, git3.py, hub.py and final.py, plus GraphQL
+`history(first: 1, path: ...)` lookups. Point an app at it by setting
+GITHUB_API_URL to `stub.url`.
+"""
+import base64
+import hashlib
+import json
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler
+from urllib.parse import parse_qs, unquote, urlparse
+
+from jira_stub import StubServer
+
+
+def blob_sha(content):
+    """Git's object id for a blob with this content."""
+    return hashlib.sha1(b"blob %d\0" % len(content) + content).hexdigest()
+
+
+class GitHubStub:
+    """Threaded HTTP server answering GitHub REST/GraphQL requests on localhost."""
+
+    def __init__(self, branches, messages=None, latency=0.0):
+        self.branches = branches          # branch -> {path: bytes}
+        self.messages = messages or {}    # path -> latest commit message
+        self.latency = latency
+        self.calls = Counter()            # endpoint kind -> request count
+        self._lock = threading.Lock()
+        self._server = StubServer(("127.0.0.1", 0), self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def count(self, kind):
+        with self._lock:
+            self.calls[kind] += 1
+
+    def tree_sha(self, branch):
+        listing = "".join(f"{path}\0{blob_sha(content)}\n"
+                          for path, content in sorted(self.branches[branch].items()))
+        return hashlib.sha1(listing.encode()).hexdigest()
+
+    def commit_sha(self, branch):
+        # Per branch, so branches with identical content still have distinct heads
+        return hashlib.sha1(f"commit {branch} {self.tree_sha(branch)}".encode()).hexdigest()
+
+    def resolve(self, ref):
+        """Branch name for a branch name, head commit SHA or root tree SHA."""
+        for branch in self.branches:
+            if ref in (branch, self.commit_sha(branch), self.tree_sha(branch)):
+                return branch
+        return None
+
+    def message(self, path):
+        return self.messages.get(path, f"Add {path}\n\nDescription of {path}")
+
+    def tree(self, ref):
+        self.count("tree")
+        branch = self.resolve(ref)
+        if branch is None:
+            return 404, {"message": "Not Found"}
+        files = self.branches[branch]
+        return 200, {
+            "sha": self.tree_sha(branch),
+            "truncated": False,
+            "tree": [{"path": path, "mode": "100644", "type": "blob",
+                      "sha": blob_sha(content), "size": len(content)}
+                     for path, content in sorted(files.items())]
+        }
+
+    def commit(self, sha):
+        """`/git/commits/{sha}`: the commit object, which names its root tree."""
+        self.count("commit")
+        branch = self.resolve(sha)
+        if branch is None:
+            return 404, {"message": "Not Found"}
+        return 200, {"sha": self.commit_sha(branch), "tree": {"sha": self.tree_sha(branch)}}
+
+    def branch_list(self):
+        self.count("branches")
+        return 200, [{"name": name, "commit": {"sha": self.commit_sha(name)}}
+                     for name in self.branches]
+
+    def head(self, ref, headers):
+        """`/commits/{ref}` with the sha media type, honouring If-None-Match."""
+        self.count("head")
+        branch = self.resolve(ref)
+        if branch is None:
+            return 404, {"message": "Not Found"}
+        sha = self.commit_sha(branch)
+        etag = f'"{sha}"'
+        if headers.get("If-None-Match") == etag:
+            return 304, b"", {"ETag": etag}
+        return 200, sha.encode(), {"ETag": etag, "Content-Type": "application/vnd.github.sha"}
+
+    def commits(self, params):
+        self.count("commits")
+        path = params.get("path")
+        if not any(path in files for files in self.branches.values()):
+            return 200, []
+        return 200, [{"commit": {"message": self.message(path)}}]
+
+    def contents(self, path, params):
+        """Like GitHub, files over 1 MB come back with no content."""
+        self.count("contents")
+        files = self.branches.get(params.get("ref")) or next(iter(self.branches.values()))
+        if path not in files:
+            return 404, {"message": "Not Found"}
+        content = files[path]
+        if len(content) > 1024 * 1024:
+            return 200, {"path": path, "sha": blob_sha(content), "size": len(content),
+                         "encoding": "none", "content": ""}
+        return 200, {"path": path, "sha": blob_sha(content), "size": len(content),
+                     "encoding": "base64", "content": base64.encodebytes(content).decode()}
+
+    def blob(self, sha, headers):
+        """`/git/blobs/{sha}`, raw bytes when asked for the raw media type."""
+        self.count("blob")
+        for files in self.branches.values():
+            for content in files.values():
+                if blob_sha(content) == sha:
+                    if headers.get("Accept") == "application/vnd.github.raw":
+                        return 200, content, {"Content-Type": "application/octet-stream"}
+                    return 200, {"sha": sha, "size": len(content), "encoding": "base64",
+                                 "content": base64.encodebytes(content).decode()}
+        return 404, {"message": "Not Found"}
+
+    def graphql(self, body):
+        self.count("graphql")
+        variables = body.get("variables", {})
+        data = {}
+        for alias, var in re.findall(r"(\w+): history\(first: 1, path: \$(\w+)\)", body.get("query", "")):
+            path = variables.get(var)
+            found = any(path in files for files in self.branches.values())
+            data[alias] = {"nodes": [{"message": self.message(path)}] if found else []}
+        if "defaultBranchRef" in body.get("query", ""):
+            return 200, {"data": {"repository": {"defaultBranchRef": {"target": data}}}}
+        return 200, {"data": {"repository": {"object": data}}}
+
+    def route(self, method, path, params, body, headers):
+        """Return (status, body[, headers]) for a request; extend for more endpoints.
+
+        A dict/list body is sent as JSON, bytes are sent as-is.
+        """
+        if method == "POST" and path == "/graphql":
+            return self.graphql(body)
+        match = re.match(r"/repos/[^/]+/[^/]+/(.*)", path)
+        rest = match.group(1) if match else ""
+        if rest.startswith("git/trees/"):
+            return self.tree(unquote(rest[len("git/trees/"):]))
+        if rest.startswith("git/commits/"):
+            return self.commit(rest[len("git/commits/"):])
+        if rest.startswith("git/blobs/"):
+            return self.blob(rest[len("git/blobs/"):], headers)
+        if rest == "branches":
+            return self.branch_list()
+        if rest == "commits":
+            return self.commits(params)
+        if rest.startswith("commits/"):
+            return self.head(unquote(rest[len("commits/"):]), headers)
+        if rest.startswith("contents/"):
+            return self.contents(unquote(rest[len("contents/"):]), params)
+        return 404, {"message": f"No route for {path}"}
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def respond(self, method):
+                time.sleep(stub.latency)
+                parsed = urlparse(self.path)
+                params = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length)) if length else {}
+                status, payload, *extra = stub.route(method, parsed.path, params, body, self.headers)
+                headers = {"Content-Type": "application/json"}
+                headers.update(extra[0] if extra else {})
+                data = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                self.respond("GET")
+
+            def do_POST(self):
+                self.respond("POST")
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
@@ -1,9 +1,10 @@
-from flask import Flask, jsonify
-import requests
+from flask import Flask, jsonify, request
 import os
-from datetime import datetime
-from collections import defaultdict
+from datetime import date
 from dotenv import load_dotenv
+import jira_fetch
+import response_cache
+import trend_engine
 
 load_dotenv("board.env")
 
@@ -17,45 +18,34 @@ PROJECT_KEY = os.getenv("PROJECT_KEY")
 
 headers = {"Content-Type": "application/json"}
 
-def fetch_daily_resolution_trend():
-    jql = f'project={PROJECT_KEY} AND resolutiondate >= "2025-01-01" ORDER BY resolutiondate ASC'
-    url = f"{JIRA_URL}/rest/api/2/search"
-    params = {
-        "jql": jql,
-        "fields": "created,resolutiondate",
-        "maxResults": 1000
-    }
-
-    response = requests.get(url, headers=headers, params=params, auth=(JIRA_USER, JIRA_TOKEN))
-    if response.status_code != 200:
-        return {"error": f"Failed to fetch from JIRA: {response.text}"}, response.status_code
-
-    issues = response.json().get("issues", [])
-
-    # Group by resolution date
-    daily_data = defaultdict(list)
-    for issue in issues:
-        created = datetime.strptime(issue["fields"]["created"][:10], "%Y-%m-%d")
-        resolved = datetime.strptime(issue["fields"]["resolutiondate"][:10], "%Y-%m-%d")
-        days_to_resolve = (resolved - created).days
-        resolved_date_str = resolved.strftime("%Y-%m-%d")
-        daily_data[resolved_date_str].append(days_to_resolve)
-
-    # Build JSON output
-    trend = []
-    for date, times in sorted(daily_data.items()):
-        avg_days = round(sum(times) / len(times), 2)
-        trend.append({
-            "date": date,
-            "resolved_count": len(times),
-            "avg_resolution_days": avg_days
-        })
-
-    return trend
+@response_cache.cached("/resolution-trend")
+def fetch_daily_resolution_trend(start=date(2025, 1, 1), end=None, bucket="day"):
+    end = end or trend_engine.last_days(1)[1]
+    jql = (f'project={PROJECT_KEY} AND {trend_engine.jql_window("resolutiondate", start, end)}'
+           ' ORDER BY resolutiondate ASC')
+    # Every page, however long the window; Jira errors raise and are not cached
+    issues = jira_fetch.fetch_all_records(
+        JIRA_URL, (JIRA_USER, JIRA_TOKEN), jql, "created,resolutiondate", headers=headers)
+
+    # Calendar days from created date to resolution date
+    created, resolved, seconds = trend_engine.resolution_columns(issues)
+    days_to_resolve = (resolved.astype("datetime64[D]") - created.astype("datetime64[D]")).astype(int)
+
+    # Only buckets that had resolutions
+    trend = trend_engine.trend(resolved, days_to_resolve, start, end, bucket)
+    return [row for row in trend if row["resolved_count"]]
 
 @app.route("/resolution-trend", methods=["GET"])
 def resolution_trend():
-    data = fetch_daily_resolution_trend()
+    # From 2025-01-01 by default; ?days=N, ?start=&end= (YYYY-MM-DD) and ?bucket=day|week|month
+    try:
+        start, end, bucket = trend_engine.window(request.args, default_start=date(2025, 1, 1))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    try:
+        data = fetch_daily_resolution_trend(start, end, bucket)
+    except Exception as e:
+        return jsonify({"error": f"Failed to fetch from JIRA: {e}"}), 500
     return jsonify(data)
 
 if __name__ == "__main__":
@@ -1,8 +1,11 @@
-from flask import Flask, jsonify
-import requests
-from datetime import datetime, timedelta
-from dateutil import parser
+from flask import Flask, jsonify, request
+from datetime import datetime, time, timedelta, timezone
 from dotenv import load_dotenv
+import issue_store
+import jira_fetch
+import resolution_rollups
+import response_cache
+import trend_engine
 import os
 
 load_dotenv("board.env")
@@ -13,81 +16,52 @@ app = Flask(__name__)
 JIRA_URL = os.getenv("JIRA_URL")
 JIRA_USER = os.getenv("JIRA_USER")
 JIRA_TOKEN = os.getenv("JIRA_TOKEN")
+JIRA_STORE = os.getenv("JIRA_STORE")  # optional SQLite path for incremental sync
+
+STORE = issue_store.IssueStore(JIRA_STORE) if JIRA_STORE else None
+ROLLUPS = resolution_rollups.ResolutionRollups(os.getenv("JIRA_ROLLUPS", "resolution_rollups.db"))
 
 
 def fetch_all_issues(jql):
     """Fetch all Jira issues matching a JQL query."""
-    issues = []
-    start_at = 0
-    max_results = 100
-    url = f"{JIRA_URL}/rest/api/2/search"
-    auth = (JIRA_USER, JIRA_TOKEN)
-    headers = {"Accept": "application/json"}
-
-    while True:
-        params = {
-            "jql": jql,
-            "fields": "created,resolutiondate",
-            "startAt": start_at,
-            "maxResults": max_results
-        }
-        response = requests.get(url, headers=headers, params=params, auth=auth)
-        if response.status_code != 200:
-            raise Exception(f"Jira API error: {response.status_code} - {response.text}")
-
-        data = response.json()
-        issues.extend(data.get("issues", []))
-        if start_at + max_results >= data.get("total", 0):
-            break
-        start_at += max_results
-    return issues
-
-
-@app.route("/resolution-trend")
-def resolution_time_trend():
-    # JQL for all projects (last 30 days of resolved issues)
-    jql = 'resolved >= -30d ORDER BY resolved ASC'
-
-    try:
-        issues = fetch_all_issues(jql)
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
-
-    trend_data = {}
+    return jira_fetch.fetch_all_records(JIRA_URL, (JIRA_USER, JIRA_TOKEN), jql, "created,resolutiondate")
 
-    for issue in issues:
-        created_str = issue["fields"].get("created")
-        resolved_str = issue["fields"].get("resolutiondate")
 
-        if not created_str or not resolved_str:
-            continue
+@response_cache.cached("/resolution-trend")
+def resolution_trend(start, end, bucket):
+    """Trend rows over [start, end] for all projects, cached per route TTL."""
+    rollups = ROLLUPS.current(JIRA_URL, (JIRA_USER, JIRA_TOKEN))
+    if rollups.covers(start):
+        return rollups.trend(start, end, bucket)
 
-        created_date = parser.isoparse(created_str)
-        resolved_date = parser.isoparse(resolved_str)
+    # Older than the rollups reach: compute from the issues. JQL for all projects
+    jql = f'{trend_engine.jql_window("resolved", start, end)} ORDER BY resolved ASC'
 
-        # Calculate resolution time in partial days
-        resolution_days = round((resolved_date - created_date).total_seconds() / 86400, 2)
+    if STORE is None:
+        issues = fetch_all_issues(jql)
+    else:
+        STORE.sync(JIRA_URL, (JIRA_USER, JIRA_TOKEN), "")
+        since = datetime.combine(start - timedelta(days=1), time(), timezone.utc).timestamp()
+        issues = STORE.issues(resolved_since=since)
+    created, resolved, seconds = trend_engine.resolution_columns(list(issues))
 
-        resolved_day = resolved_date.date()
-        trend_data.setdefault(resolved_day, []).append(resolution_days)
+    # Resolution time in partial days, rounded per issue as before
+    resolution_days = trend_engine.rounded_days(seconds)
+    return trend_engine.trend(resolved, resolution_days, start, end, bucket)
 
-    # Build daily trend for the last 30 days
-    today = datetime.utcnow().date()
-    start_date = today - timedelta(days=29)
 
-    avg_trend = []
-    for n in range(30):
-        day = start_date + timedelta(days=n)
-        resolutions = trend_data.get(day, [])
-        avg_days = round(sum(resolutions) / len(resolutions), 2) if resolutions else 0
-        resolved_count = len(resolutions)
-        avg_trend.append({
-            "date": day.isoformat(),
-            "avg_resolution_days": avg_days,
-            "resolved_count": resolved_count
-        })
+@app.route("/resolution-trend")
+def resolution_time_trend():
+    # Last 30 days by default; ?days=N, ?start=&end= (YYYY-MM-DD) and ?bucket=day|week|month
+    try:
+        start, end, bucket = trend_engine.window(request.args, default_days=30)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
 
-    return jsonify(avg_trend)
+    try:
+        return jsonify(resolution_trend(start, end, bucket))
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
 
 
 if __name__ == "__main__":
@@ -0,0 +1,46 @@
+"""Shared pooled HTTP sessions for the Jira and GitHub clients.
+
+A bare `requests.get` opens a fresh TCP + TLS connection per call. These
+sessions keep connections alive in a pool, carry auth and headers set once,
+and ask for gzip-compressed responses.
+"""
+import os
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Keep-alive connections held per host
+POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "32"))
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+def make_session(auth=None, headers=None, pool_size=POOL_SIZE):
+    session = requests.Session()
+    session.auth = auth
+    session.headers.update({"Accept-Encoding": "gzip, deflate"})
+    session.headers.update(headers or {})
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_session(name, auth=None, headers=None, pool_size=POOL_SIZE):
+    """Process-wide session for `name` and these credentials, created on first use."""
+    key = (name, auth, tuple(sorted((headers or {}).items())))
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = _sessions[key] = make_session(auth, headers, pool_size)
+        return session
+
+
+def jira_session(auth):
+    return get_session("jira", auth=auth)
+
+
+def github_session(headers):
+    return get_session("github", headers=headers)
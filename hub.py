@@ -1,8 +1,15 @@
+import io
 import os
 import requests
-import base64
 from flask import Flask, request, jsonify
 from dotenv import load_dotenv
+import http_client
+import doc_text
+import extract_pool
+import file_index
+import repo_files
+import search_index
+import text_cache
 import fitz  # PyMuPDF
 from docx import Document
 
@@ -13,78 +20,87 @@ app = Flask(__name__)
 GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
 GITHUB_REPO_OWNER = os.getenv("GITHUB_REPO_OWNER")
 GITHUB_REPO_NAME = os.getenv("GITHUB_REPO_NAME")
+GITHUB_API_URL = os.getenv("GITHUB_API_URL", "https://api.github.com")
 
 HEADERS = {
     "Authorization": f"token {GITHUB_TOKEN}"
 }
+GITHUB = http_client.github_session(HEADERS)
 
 VALID_EXTENSIONS = [".pdf", ".txt", ".docx"]
 
+TEXT_CACHE = text_cache.TextCache(os.getenv("TEXT_CACHE", "hub_text_cache.db"))
+EXTRACTOR = extract_pool.ExtractPool()
+SEARCH = search_index.SearchIndex(os.getenv("SEARCH_INDEX", "hub_search.db"))
+
 # ---------------------------
 # GitHub API Helpers
 # ---------------------------
 
-def list_all_branches():
-    url = f"https://api.github.com/repos/{GITHUB_REPO_OWNER}/{GITHUB_REPO_NAME}/branches"
-    response = requests.get(url, headers=HEADERS)
-    if response.status_code != 200:
-        return []
-    return [branch["name"] for branch in response.json()]
-
-def fetch_files_from_branch(branch_name):
-    url = f"https://api.github.com/repos/{GITHUB_REPO_OWNER}/{GITHUB_REPO_NAME}/git/trees/{branch_name}?recursive=1"
-    response = requests.get(url, headers=HEADERS)
-    if response.status_code != 200:
-        return []
-    tree = response.json().get("tree", [])
-    return [
-        item["path"]
-        for item in tree
-        if item["type"] == "blob"
-        and os.path.splitext(item["path"])[1].lower() in VALID_EXTENSIONS
+def is_valid_file(item):
+    return (
+        os.path.splitext(item["path"])[1].lower() in VALID_EXTENSIONS
         and os.path.basename(item["path"]).lower() != "readme.md"
-    ]
+    )
 
 def fetch_all_valid_files():
-    branches = list_all_branches()
-    all_files = set()
-    for branch in branches:
-        files = fetch_files_from_branch(branch)
-        all_files.update(files)
-    return list(all_files)
-
-def get_file_content_from_github(file_path):
-    url = f"https://api.github.com/repos/{GITHUB_REPO_OWNER}/{GITHUB_REPO_NAME}/contents/{file_path}"
-    response = requests.get(url, headers=HEADERS)
-    if response.status_code != 200:
-        return None, response.status_code
-    content = base64.b64decode(response.json()["content"])
+    """Valid files across all branches as RepoFile(path, sha, branch), one per blob."""
+    return repo_files.crawl(
+        GITHUB, GITHUB_API_URL, f"{GITHUB_REPO_OWNER}/{GITHUB_REPO_NAME}", is_valid_file)
+
+FILES = file_index.FileIndex(os.getenv("FILE_INDEX", "hub_file_index.db"), GITHUB, GITHUB_API_URL,
+                             f"{GITHUB_REPO_OWNER}/{GITHUB_REPO_NAME}", is_valid_file)
+
+def get_file_content_from_github(repo_file):
+    try:
+        content = repo_files.download_blob(
+            GITHUB, GITHUB_API_URL, f"{GITHUB_REPO_OWNER}/{GITHUB_REPO_NAME}", repo_file.sha)
+    except requests.HTTPError as e:
+        return None, e.response.status_code
+    except Exception as e:
+        print("Error:", e)
+        return None, 502
     return content, 200
 
+def download_for_extraction(repo_file):
+    """(content, ext) for extract_description, or None if the download failed."""
+    content, status = get_file_content_from_github(repo_file)
+    if not content:
+        return None
+    return content, os.path.splitext(repo_file.path)[1].lower()
+
 # ---------------------------
 # Content Extraction Helpers
 # ---------------------------
 
 def extract_description(content, ext):
     try:
+        # Read only until the first line is complete
         if ext == ".txt":
-            return content.decode().split("\n")[0]
+            return doc_text.first_line(doc_text.iter_txt(content), clean=lambda text: text)
         elif ext == ".pdf":
             doc = fitz.open(stream=content, filetype="pdf")
-            text = ""
-            for page in doc:
-                text += page.get_text()
-            return text.strip().split("\n")[0]
+            return doc_text.first_line(doc_text.iter_pdf_pages(doc))
         elif ext == ".docx":
-            with open("temp.docx", "wb") as f:
-                f.write(content)
-            doc = Document("temp.docx")
+            doc = Document(io.BytesIO(content))
             return doc.paragraphs[0].text if doc.paragraphs else ""
         else:
             return "Unsupported file"
     except Exception as e:
         return f"Error reading file: {str(e)}"
 
+def extract_text(content, ext):
+    """Full text of a document, or None for an unsupported type."""
+    if ext == ".txt":
+        return content.decode()
+    elif ext == ".pdf":
+        doc = fitz.open(stream=content, filetype="pdf")
+        return "".join([page.get_text() for page in doc]).strip()
+    elif ext == ".docx":
+        doc = Document(io.BytesIO(content))
+        return "\n".join(p.text for p in doc.paragraphs).strip()
+    return None
+
 # ---------------------------
 # API 1: Get all files with descriptions
 # ---------------------------
@@ -92,19 +108,27 @@ def extract_description(content, ext):
 @app.route("/get-all-files", methods=["GET"])
 def get_all_files():
     files = fetch_all_valid_files()
-    output = []
+    descriptions = TEXT_CACHE.get_many([f.sha for f in files], "description")
 
-    for file_path in files:
-        file_name = os.path.basename(file_path)
-        ext = os.path.splitext(file_name)[1].lower()
-        content, status = get_file_content_from_github(file_path)
-        if content:
-            desc = extract_description(content, ext)
-        else:
+    # Download and parse only the blobs not seen before, across worker processes
+    missing = [f for f in repo_files.distinct_blobs(files) if f.sha not in descriptions]
+    parsed = EXTRACTOR.map(missing, download_for_extraction, extract_description)
+    for repo_file, desc in zip(missing, parsed):
+        if desc is None:
             desc = "Unable to fetch"
+        elif desc is extract_pool.TIMED_OUT:
+            desc = "Error reading file: timed out"
+        elif desc is extract_pool.CRASHED:
+            desc = "Error reading file: parser crashed"
+        else:
+            TEXT_CACHE.put(repo_file.sha, "description", desc)
+        descriptions[repo_file.sha] = desc
+
+    output = []
+    for repo_file in files:
         output.append({
-            "file_name": file_name,
-            "description": desc
+            "file_name": os.path.basename(repo_file.path),
+            "description": descriptions[repo_file.sha]
         })
 
     return jsonify(output)
@@ -120,40 +144,46 @@ def get_file_content():
     if not filename:
         return jsonify({"error": "file_name is required"}), 400
 
-    files = fetch_all_valid_files()
-    match = next((f for f in files if os.path.basename(f) == filename), None)
+    match = FILES.find(filename)
 
     if not match:
         return jsonify({"error": "File not found"}), 404
 
-    ext = os.path.splitext(filename)[1].lower()
-    content, status = get_file_content_from_github(match)
-    if status != 200 or content is None:
-        return jsonify({"error": "Could not fetch file"}), 500
+    text = TEXT_CACHE.get(match.sha, "text")
+    if text is None:
+        ext = os.path.splitext(filename)[1].lower()
+        content, status = get_file_content_from_github(match)
+        if status != 200 or content is None:
+            return jsonify({"error": "Could not fetch file"}), 500
+        text = extract_text(content, ext)
+        if text is None:
+            return jsonify({"error": "Unsupported file type"}), 400
+        TEXT_CACHE.put(match.sha, "text", text)
+
+    return jsonify({
+        "file_name": filename,
+        "content": text
+    })
 
-    if ext == ".txt":
-        return jsonify({
-            "file_name": filename,
-            "content": content.decode()
-        })
-    elif ext == ".pdf":
-        doc = fitz.open(stream=content, filetype="pdf")
-        text = "".join([page.get_text() for page in doc])
-        return jsonify({
-            "file_name": filename,
-            "content": text.strip()
-        })
-    elif ext == ".docx":
-        with open("temp.docx", "wb") as f:
-            f.write(content)
-        doc = Document("temp.docx")
-        text = "\n".join(p.text for p in doc.paragraphs)
-        return jsonify({
-            "file_name": filename,
-            "content": text.strip()
-        })
-    else:
-        return jsonify({"error": "Unsupported file type"}), 400
+# ---------------------------
+# API 3: Full-text search over document contents
+# ---------------------------
+
+def extract_searchable_text(content, ext):
+    """extract_text for the search index; a document that fails to parse is indexed as empty."""
+    try:
+        return extract_text(content, ext) or ""
+    except Exception as e:
+        print("Error:", e)
+        return ""
+
+DOCUMENT_SEARCH = search_index.DocumentSearch(SEARCH, fetch_all_valid_files, TEXT_CACHE, EXTRACTOR,
+                                              download_for_extraction, extract_searchable_text)
+
+@app.route("/search", methods=["GET"])
+def search_files():
+    payload, status = DOCUMENT_SEARCH.respond(request.args)
+    return jsonify(payload), status
 
 # ---------------------------
 # App Runner
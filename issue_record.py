@@ -0,0 +1,46 @@
+"""Compact issue records for the dashboard and trend routes.
+
+Jira search results carry much more than the routes read: `self`, `expand`
+and `id` on every issue, and status/issuetype/priority objects with icon
+URLs, descriptions and status categories. Each page is decoded into
+IssueRecord tuples as it arrives and the JSON is dropped, so an issue
+costs one small tuple instead of a tree of dicts. Project, type, status
+and priority names repeat across issues and are interned, so every
+record shares one copy of each.
+
+Timestamps stay as Jira sent them; jira_time decodes them a column at a
+time.
+"""
+import sys
+from collections import namedtuple
+
+IssueRecord = namedtuple("IssueRecord", "key project type status priority created resolved")
+
+
+def intern(value):
+    return sys.intern(value) if value is not None else None
+
+
+def name(field, attribute="name"):
+    """Interned name of a nested Jira object such as `status`, or None."""
+    return intern(field.get(attribute)) if field else None
+
+
+def record(key, project, issue_type, status, priority, created, resolved):
+    """IssueRecord with its repeated names interned, e.g. from a stored row."""
+    return IssueRecord(key, intern(project), intern(issue_type), intern(status), intern(priority),
+                       created, resolved)
+
+
+def from_issue(issue):
+    """IssueRecord for one issue of a search response."""
+    fields = issue.get("fields") or {}
+    return IssueRecord(
+        issue["key"],
+        name(fields.get("project"), "key"),
+        name(fields.get("issuetype")),
+        name(fields.get("status")),
+        name(fields.get("priority")),
+        fields.get("created"),
+        fields.get("resolutiondate")
+    )
@@ -0,0 +1,145 @@
+"""Local SQLite copy of the Jira issue fields the dashboards use.
+
+`sync` only asks Jira for issues whose `updated` moved since the previous
+sync of the same scope, so after the first run each refresh costs as much as
+what changed. Dashboards then read from the local table.
+
+Deleted issues and issues moved to another project are not detected by an
+incremental sync; call `sync(..., full=True)` to rebuild a scope.
+"""
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+import issue_record
+import jira_fetch
+import jira_time
+
+STORE_FIELDS = "project,issuetype,status,priority,created,resolutiondate,updated"
+
+# Seconds re-fetched on every sync to cover clock skew between us and Jira
+SYNC_OVERLAP = 300
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS issues (
+    key TEXT PRIMARY KEY,
+    project TEXT,
+    issuetype TEXT,
+    status TEXT,
+    priority TEXT,
+    created TEXT,
+    resolutiondate TEXT,
+    resolved_ts REAL,
+    updated TEXT
+);
+CREATE INDEX IF NOT EXISTS issues_project_type ON issues (project, issuetype);
+CREATE INDEX IF NOT EXISTS issues_resolved ON issues (resolved_ts);
+CREATE TABLE IF NOT EXISTS sync_state (
+    scope TEXT PRIMARY KEY,
+    last_sync REAL
+);
+"""
+
+
+def issue_row(issue):
+    fields = issue.get("fields", {}) or {}
+    return (
+        issue["key"],
+        (fields.get("project") or {}).get("key"),
+        (fields.get("issuetype") or {}).get("name"),
+        (fields.get("status") or {}).get("name"),
+        (fields.get("priority") or {}).get("name"),
+        fields.get("created"),
+        fields.get("resolutiondate"),
+        jira_time.to_epoch(fields.get("resolutiondate")),
+        fields.get("updated")
+    )
+
+
+def scope_project(scope):
+    """Project key for a `project=KEY` scope, else None."""
+    name, sep, value = scope.partition("=")
+    if sep and name.strip().lower() == "project" and " " not in value.strip():
+        return value.strip().strip('"')
+    return None
+
+
+class IssueStore:
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def last_sync(self, scope):
+        with self._connect() as conn:
+            row = conn.execute("SELECT last_sync FROM sync_state WHERE scope = ?", (scope,)).fetchone()
+        return row[0] if row else None
+
+    def sync(self, jira_url, auth, scope="", full=False):
+        """Pull issues in `scope` (a JQL filter, "" for everything) updated since the last sync.
+
+        Returns the number of issues written.
+        """
+        with self._lock:
+            started = time.time()
+            last_sync = None if full else self.last_sync(scope)
+
+            jql = scope
+            if last_sync is not None:
+                # Relative JQL durations avoid Jira/user timezone mismatches
+                minutes = int((started - last_sync + SYNC_OVERLAP) // 60) + 1
+                changed = f"updated >= -{minutes}m"
+                jql = f"({scope}) AND {changed}" if scope else changed
+
+            written = 0
+            with self._connect() as conn:
+                if full:
+                    project = scope_project(scope)
+                    if project:
+                        conn.execute("DELETE FROM issues WHERE project = ?", (project,))
+                    elif not scope:
+                        conn.execute("DELETE FROM issues")
+                # Write page by page so a full sync never holds the whole result set
+                for issues in jira_fetch.iter_issue_pages(jira_url, auth, jql, STORE_FIELDS):
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO issues VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        [issue_row(issue) for issue in issues]
+                    )
+                    written += len(issues)
+                conn.execute(
+                    "INSERT OR REPLACE INTO sync_state VALUES (?, ?)", (scope, started)
+                )
+            return written
+
+    def issues(self, project=None, issuetype=None, resolved_since=None):
+        """Yield stored issues matching the filters as IssueRecords."""
+        clauses, params = [], []
+        if project is not None:
+            clauses.append("project = ?")
+            params.append(project)
+        if issuetype is not None:
+            clauses.append("issuetype = ?")
+            params.append(issuetype)
+        if resolved_since is not None:
+            clauses.append("resolved_ts >= ?")
+            params.append(resolved_since)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "SELECT key, project, issuetype, status, priority, created, resolutiondate "
+                f"FROM issues{where} ORDER BY key", params
+            )
+            for row in cursor:
+                yield issue_record.record(*row)
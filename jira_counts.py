@@ -0,0 +1,94 @@
+"""Count-only Jira queries.
+
+Dashboards that only need totals per status / priority bucket / issue type
+can ask Jira for `total` with `maxResults=0` instead of downloading issues.
+The status, priority and issue type lists are fetched once and cached, so a
+refresh costs a fixed number of tiny requests whatever the project size.
+"""
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import http_client
+import jira_fetch
+
+# How long the status / priority / issue type lists are trusted
+METADATA_TTL = 3600
+
+_metadata = {}
+_metadata_lock = threading.Lock()
+
+
+def get_names(jira_url, auth, endpoint):
+    """Distinct `name`s from a Jira list endpoint (status, priority, issuetype), cached."""
+    key = (jira_url, endpoint)
+    with _metadata_lock:
+        cached = _metadata.get(key)
+    if cached and time.monotonic() - cached[0] < METADATA_TTL:
+        return cached[1]
+
+    # Fetched outside the lock so one slow endpoint doesn't hold up the others;
+    # concurrent misses may each fetch, and the last one stored wins
+    url = f"{jira_url}/rest/api/2/{endpoint}"
+    response = http_client.jira_session(auth).get(
+        url, headers=jira_fetch.DEFAULT_HEADERS, timeout=jira_fetch.TIMEOUT)
+    if response.status_code != 200:
+        raise Exception(f"Jira API error: {response.status_code} - {response.text}")
+    names = list(dict.fromkeys(item["name"] for item in response.json()))
+    with _metadata_lock:
+        _metadata[key] = (time.monotonic(), names)
+    return names
+
+
+def get_statuses(jira_url, auth):
+    return get_names(jira_url, auth, "status")
+
+
+def get_priorities(jira_url, auth):
+    return get_names(jira_url, auth, "priority")
+
+
+def get_issue_types(jira_url, auth):
+    return get_names(jira_url, auth, "issuetype")
+
+
+def find_name(names, wanted):
+    """The name from `names` equal to `wanted` ignoring case, or None."""
+    return next((name for name in names if name.lower() == wanted.lower()), None)
+
+
+def quote(value):
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def and_jql(jql, clause):
+    return f"({jql}) AND {clause}" if jql else clause
+
+
+def count_issues(jira_url, auth, jql):
+    """Number of issues matching `jql`, without fetching any of them."""
+    url = f"{jira_url}/rest/api/2/search"
+    return jira_fetch.fetch_page(url, auth, jql, "key", 0, max_results=0).get("total", 0)
+
+
+def count_by_status(jira_url, auth, jql, max_workers=jira_fetch.MAX_WORKERS):
+    """Counter of status name -> matching issues, one count query per known status."""
+    statuses = get_statuses(jira_url, auth)
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        totals = pool.map(
+            lambda status: count_issues(jira_url, auth, and_jql(jql, f"status = {quote(status)}")),
+            statuses
+        )
+        return Counter({status: total for status, total in zip(statuses, totals) if total})
+
+
+def count_priorities(jira_url, auth, jql, priority_names):
+    """Issues matching `jql` whose priority is one of `priority_names` (any case)."""
+    # Naming a priority Jira doesn't know is a JQL error, so only ask for real ones
+    known = [name for name in get_priorities(jira_url, auth)
+             if name.lower() in {p.lower() for p in priority_names}]
+    if not known:
+        return 0
+    clause = f"priority in ({', '.join(quote(name) for name in known)})"
+    return count_issues(jira_url, auth, and_jql(jql, clause))
@@ -0,0 +1,99 @@
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+import requests
+
+import http_client
+import issue_record
+
+# Paging / concurrency defaults for the Jira search API
+MAX_RESULTS = 100
+MAX_WORKERS = 8
+RETRIES = 3
+RETRY_BACKOFF = 0.5
+TIMEOUT = 30
+
+DEFAULT_HEADERS = {"Accept": "application/json"}
+
+
+def fetch_page(url, auth, jql, fields, start_at, max_results=MAX_RESULTS, headers=None, retries=RETRIES):
+    """Fetch one page of search results, retrying transient failures."""
+    params = {
+        "jql": jql,
+        "startAt": start_at,
+        "maxResults": max_results,
+        "fields": fields
+    }
+    error = None
+    for attempt in range(retries + 1):
+        try:
+            response = http_client.jira_session(auth).get(
+                url, headers=headers or DEFAULT_HEADERS, params=params, timeout=TIMEOUT)
+        except requests.RequestException as e:
+            error = str(e)
+        else:
+            if response.status_code == 200:
+                return response.json()
+            error = f"{response.status_code} - {response.text}"
+            # Client errors (bad JQL, auth) won't succeed on retry
+            if response.status_code < 500 and response.status_code != 429:
+                break
+        if attempt < retries:
+            time.sleep(RETRY_BACKOFF * 2 ** attempt)
+    raise Exception(f"Jira API error: {error}")
+
+
+def iter_issue_pages(jira_url, auth, jql, fields, max_results=MAX_RESULTS,
+                     max_workers=MAX_WORKERS, headers=None):
+    """Yield the issue list of each search page, in order, as pages arrive.
+
+    The first page tells us `total`; later `startAt` offsets are requested in
+    parallel, with at most `max_workers` pages in flight so memory stays
+    bounded however large the result set is.
+    """
+    url = f"{jira_url}/rest/api/2/search"
+    first = fetch_page(url, auth, jql, fields, 0, max_results, headers)
+    issues = first.get("issues", [])
+    total = first.get("total", 0)
+    yield issues
+
+    # Jira may cap maxResults below what we asked for, so page by what it returned
+    page_size = len(issues) or max_results
+    offsets = iter(range(page_size, total, page_size))
+    if not issues:
+        return
+
+    def fetch(start_at):
+        return fetch_page(url, auth, jql, fields, start_at, page_size, headers)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        pending = deque(pool.submit(fetch, start_at) for start_at in islice(offsets, max_workers))
+        while pending:
+            page = pending.popleft().result()
+            for start_at in islice(offsets, 1):
+                pending.append(pool.submit(fetch, start_at))
+            yield page.get("issues", [])
+
+
+def iter_issues(jira_url, auth, jql, fields, **kwargs):
+    """Yield issues one at a time; each page is released once consumed."""
+    for issues in iter_issue_pages(jira_url, auth, jql, fields, **kwargs):
+        yield from issues
+
+
+def fetch_all_issues(jira_url, auth, jql, fields, **kwargs):
+    """Fetch all issues for a JQL query into a list."""
+    return list(iter_issues(jira_url, auth, jql, fields, **kwargs))
+
+
+def iter_records(jira_url, auth, jql, fields, **kwargs):
+    """Yield an IssueRecord per issue; only the current page's JSON is kept."""
+    for issues in iter_issue_pages(jira_url, auth, jql, fields, **kwargs):
+        yield from map(issue_record.from_issue, issues)
+
+
+def fetch_all_records(jira_url, auth, jql, fields, **kwargs):
+    """Fetch IssueRecords for all issues of a JQL query into a list."""
+    return list(iter_records(jira_url, auth, jql, fields, **kwargs))
@@ -0,0 +1,208 @@
+"""Local stand-in for the Jira REST API, used by the benchmarks.
+
+Serves a synthetic, deterministic issue set from /rest/api/2/search with a
+configurable per-request latency and failure rate.
+"""
+import json
+import random
+import re
+import ssl
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+STATUSES = ["To Do", "In Progress", "Done", "Accepted", "Rejected", "Generated"]
+PRIORITIES = ["Highest", "High", "Medium", "Low", None]
+ISSUE_TYPES = ["Task", "Bug", "Test Case"]
+PROJECTS = ["ALPHA", "BETA", "GAMMA"]
+PAGE_CAP = 100
+
+EPOCH = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def jira_timestamp(dt):
+    return dt.strftime("%Y-%m-%dT%H:%M:%S.000+0000")
+
+
+def make_issue(n, updated=None):
+    """Build the n-th synthetic issue in the shape Jira returns it."""
+    created = EPOCH + timedelta(hours=n)
+    resolved = created + timedelta(hours=1 + n % 240) if n % 3 else None
+    priority = PRIORITIES[n % len(PRIORITIES)]
+    return {
+        "expand": "operations,versionedRepresentations,editmeta,changelog,renderedFields",
+        "id": str(10000 + n),
+        "self": f"https://jira.example.com/rest/api/2/issue/{10000 + n}",
+        "key": f"{PROJECTS[n % len(PROJECTS)]}-{n}",
+        "fields": {
+            "project": {"key": PROJECTS[n % len(PROJECTS)]},
+            "issuetype": {
+                "self": "https://jira.example.com/rest/api/2/issuetype/1",
+                "iconUrl": "https://jira.example.com/images/icons/issuetypes/task.svg",
+                "description": "A task that needs to be done.",
+                "name": ISSUE_TYPES[n % len(ISSUE_TYPES)],
+                "subtask": False
+            },
+            "status": {
+                "self": "https://jira.example.com/rest/api/2/status/1",
+                "description": "",
+                "iconUrl": "https://jira.example.com/images/icons/statuses/open.png",
+                "name": STATUSES[n % len(STATUSES)],
+                "statusCategory": {"key": "new", "colorName": "blue-gray", "name": "To Do"}
+            },
+            "priority": {
+                "self": "https://jira.example.com/rest/api/2/priority/3",
+                "iconUrl": "https://jira.example.com/images/icons/priorities/medium.svg",
+                "name": priority
+            } if priority else None,
+            "created": jira_timestamp(created),
+            "resolutiondate": jira_timestamp(resolved) if resolved else None,
+            "updated": jira_timestamp(updated or resolved or created)
+        }
+    }
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # Load tests open hundreds of connections at once
+    request_queue_size = 1024
+
+
+class JiraStub:
+    """Threaded HTTP server answering Jira search requests on localhost."""
+
+    def __init__(self, total=1000, latency=0.02, fail_rate=0.0, certfile=None, keyfile=None):
+        self.total = total
+        self.latency = latency
+        self.fail_rate = fail_rate
+        self.requests = 0
+        self.touched = {}  # issue number -> time it was last "edited"
+        self._lock = threading.Lock()
+        self._server = StubServer(("127.0.0.1", 0), self._handler())
+        self.scheme = "http"
+        if certfile:
+            context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            context.load_cert_chain(certfile, keyfile)
+            self._server.socket = context.wrap_socket(self._server.socket, server_side=True)
+            self.scheme = "https"
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self._server.server_address
+        return f"{self.scheme}://{host}:{port}"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def touch(self, *numbers):
+        """Mark issues as edited now, so `updated >= -Nm` queries return them."""
+        now = datetime.now(timezone.utc)
+        for n in numbers:
+            self.touched[n] = now
+
+    def matching(self, jql):
+        """Issue numbers matching the JQL clauses the stub understands."""
+        jql = jql or ""
+        numbers = range(self.total)
+        project = re.search(r'project\s*=\s*"?(\w+)"?', jql)
+        if project:
+            index = PROJECTS.index(project.group(1)) if project.group(1) in PROJECTS else len(PROJECTS)
+            numbers = range(index, self.total, len(PROJECTS))
+        numbers = self._filter(numbers, jql, "status", STATUSES)
+        numbers = self._filter(numbers, jql, "issuetype", ISSUE_TYPES)
+        numbers = self._filter(numbers, jql, "priority", PRIORITIES)
+        changed = re.search(r"updated >= -(\d+)m", jql or "")
+        if changed:
+            since = datetime.now(timezone.utc) - timedelta(minutes=int(changed.group(1)))
+            numbers = [n for n in numbers if self.touched.get(n, EPOCH) >= since]
+        return numbers
+
+    @staticmethod
+    def _filter(numbers, jql, field, values):
+        """Apply `field = "x"`, `field != "x"` or `field in ("x", ...)` clauses."""
+        clause = re.search(field + r'\s*(=|!=|in)\s*("[^"]*"|\w+|\([^)]*\))', jql, re.I)
+        if not clause:
+            return numbers
+        op, operand = clause.group(1).lower(), clause.group(2)
+        wanted = {v.strip().strip('"').lower() for v in operand.strip("()").split(",")}
+        keep = (lambda value: value not in wanted) if op == "!=" else (lambda value: value in wanted)
+        return [n for n in numbers if keep((values[n % len(values)] or "").lower())]
+
+    def search(self, params):
+        start_at = int(params.get("startAt", 0))
+        max_results = min(int(params.get("maxResults", 50)), PAGE_CAP)
+        numbers = self.matching(params.get("jql"))
+        return {
+            "startAt": start_at,
+            "maxResults": max_results,
+            "total": len(numbers),
+            "issues": [make_issue(n, self.touched.get(n))
+                       for n in numbers[start_at:start_at + max_results]]
+        }
+
+    def route(self, path, params):
+        """Return (status, body) for a GET request; extend for more endpoints."""
+        if path == "/rest/api/2/search":
+            return 200, self.search(params)
+        if path == "/rest/api/2/project":
+            return 200, [{"key": key} for key in PROJECTS]
+        if path == "/rest/api/2/status":
+            return 200, [{"name": name} for name in STATUSES]
+        if path == "/rest/api/2/priority":
+            return 200, [{"name": name} for name in PRIORITIES if name]
+        if path == "/rest/api/2/issuetype":
+            return 200, [{"name": name} for name in ISSUE_TYPES]
+        return 404, {"errorMessages": [f"No route for {path}"]}
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # Keep-alive, so pooled clients can reuse connections
+            protocol_version = "HTTP/1.1"
+            # Headers and body go out in separate writes; don't let Nagle hold the body
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                with stub._lock:
+                    stub.requests += 1
+                time.sleep(stub.latency)
+                parsed = urlparse(self.path)
+                params = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+                if stub.fail_rate and random.random() < stub.fail_rate:
+                    status, body = 503, {"errorMessages": ["Service Unavailable"]}
+                else:
+                    status, body = stub.route(parsed.path, params)
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+if __name__ == "__main__":
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--total", type=int, default=1000)
+    arg_parser.add_argument("--latency", type=float, default=0.02)
+    arg_parser.add_argument("--fail-rate", type=float, default=0.0)
+    args = arg_parser.parse_args()
+
+    with JiraStub(args.total, args.latency, args.fail_rate) as stub:
+        print(stub.url, flush=True)
+        threading.Event().wait()
@@ -0,0 +1,78 @@
+"""Decoding of Jira timestamps such as 2025-01-01T10:00:00.000+0000.
+
+Jira always sends date-time fields in one fixed shape, so the wall-clock
+part is cut off by position and parsed as a naive timestamp, and the UTC
+offset suffix is looked up in a memoized table instead of going through a
+general ISO-8601 parser. Values in any other ISO shape (no milliseconds,
+`Z`, `+05:00`) fall back to datetime.fromisoformat.
+
+`to_epoch` decodes one value; `parse_times` and `epochs` decode a column
+of values into NumPy arrays in one pass.
+"""
+from datetime import datetime
+from functools import lru_cache
+
+import numpy as np
+
+EPOCH = datetime(1970, 1, 1)
+
+# len("2025-01-01T10:00:00.000+0000")
+JIRA_LENGTH = 28
+
+
+@lru_cache(maxsize=None)
+def offset_ms(suffix):
+    """Milliseconds east of UTC for a timestamp suffix such as +0530, -05:00 or Z."""
+    if suffix in ("", "Z"):
+        return 0
+    digits = suffix[1:].replace(":", "")
+    minutes = int(digits[:2]) * 60 + int(digits[2:4])
+    return (minutes if suffix[0] == "+" else -minutes) * 60000
+
+
+def is_jira_shape(value):
+    return len(value) == JIRA_LENGTH and value[19] == "." and value[23] in "+-"
+
+
+def split_iso(value):
+    """(wall clock as YYYY-MM-DDTHH:MM:SS.mmm, ms east of UTC) for any other ISO timestamp."""
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    offset = parsed.utcoffset()
+    return (parsed.replace(tzinfo=None).isoformat(timespec="milliseconds"),
+            int(offset.total_seconds() * 1000) if offset else 0)
+
+
+def to_epoch(value):
+    """Epoch seconds for a Jira timestamp, or None for a missing one."""
+    if not value:
+        return None
+    if is_jira_shape(value):
+        return (datetime.fromisoformat(value[:23]) - EPOCH).total_seconds() - offset_ms(value[23:]) / 1000
+    return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+
+
+def parse_times(values):
+    """(local wall-clock, UTC) datetime64[ms] arrays for Jira timestamps; missing values give NaT."""
+    walls = []
+    offsets = []
+    for value in values:
+        if not value:
+            walls.append("NaT")
+            offsets.append(0)
+        elif is_jira_shape(value):
+            walls.append(value[:23])
+            offsets.append(offset_ms(value[23:]))
+        else:
+            wall, offset = split_iso(value)
+            walls.append(wall)
+            offsets.append(offset)
+    local = np.array(walls, dtype="datetime64[ms]")
+    return local, local - np.array(offsets, dtype="timedelta64[ms]")
+
+
+def epochs(values):
+    """Float64 epoch seconds for Jira timestamps; missing values give NaN."""
+    _, utc = parse_times(values)
+    seconds = utc.astype(np.int64) / 1000.0
+    seconds[np.isnat(utc)] = np.nan
+    return seconds
@@ -0,0 +1,31 @@
+"""Sorted basename index for `startswith` lookups over a repo tree.
+
+Build once per tree version (see tree_cache.TreeCache.derive); each lookup
+is then a bisect plus a scan over the matches, O(log n + matches), instead
+of a pass over every blob.
+"""
+import os
+from bisect import bisect_left
+
+
+class PrefixIndex:
+    def __init__(self, items):
+        entries = sorted(
+            (os.path.basename(item["path"]), position)
+            for position, item in enumerate(items)
+            if item["type"] == "blob"
+        )
+        self.names = [name for name, _ in entries]
+        self.positions = [position for _, position in entries]
+
+    def matches(self, prefix):
+        """Positions (in the original item list) of blobs whose basename starts with `prefix`."""
+        start = bisect_left(self.names, prefix)
+        for k in range(start, len(self.names)):
+            if not self.names[k].startswith(prefix):
+                break
+            yield self.positions[k]
+
+    def matches_any(self, prefixes):
+        """Sorted positions of blobs matching at least one prefix, each listed once."""
+        return sorted({position for prefix in prefixes for position in self.matches(prefix)})
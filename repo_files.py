@@ -0,0 +1,113 @@
+"""Crawl every branch of a repo for document files.
+
+The `/branches` listing already carries each branch's head commit SHA, so
+branches sharing a head are crawled once. Each head is resolved to its root
+tree SHA (a small commit-object request, cached in tree_cache) and only
+distinct trees are downloaded, in parallel. A file is kept once per
+(path, blob SHA); callers download and parse each blob SHA once.
+"""
+import hashlib
+import os
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+import tree_cache
+
+RepoFile = namedtuple("RepoFile", "path sha branch")
+
+# Concurrent tree downloads per crawl
+BRANCH_WORKERS = int(os.getenv("GITHUB_BRANCH_WORKERS", "8"))
+
+# Largest blob download accepted (GitHub's blob API serves up to 100 MB)
+BLOB_MAX_BYTES = int(os.getenv("BLOB_MAX_BYTES", str(100 * 1024 * 1024)))
+
+
+def list_branches(session, api_url, repo):
+    """[(branch name, head commit sha)], following `Link: rel="next"` pages."""
+    url = f"{api_url}/repos/{repo}/branches"
+    params = {"per_page": 100}
+    branches = []
+    while url:
+        response = session.get(url, params=params)
+        if response.status_code != 200:
+            break
+        branches.extend((branch["name"], branch["commit"]["sha"]) for branch in response.json())
+        url = response.links.get("next", {}).get("url")
+        params = None  # the next link already carries the query
+    return branches
+
+
+def crawl(session, api_url, repo, wanted, workers=BRANCH_WORKERS):
+    """RepoFile for each distinct (path, blob SHA) whose tree item satisfies `wanted(item)`.
+
+    Earlier branches in the listing win when the same file appears on several.
+    Branches whose tree can't be fetched are left out.
+    """
+    heads = {}
+    for name, head in list_branches(session, api_url, repo):
+        heads.setdefault(head, name)
+
+    def tree_sha(head):
+        try:
+            return tree_cache.TREES.tree_sha(session, api_url, repo, head)
+        except requests.HTTPError:
+            return None
+
+    def fetch(sha):
+        try:
+            return tree_cache.TREES.get_tree_by_sha(session, api_url, repo, sha)
+        except requests.HTTPError:
+            return None
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        # Branches with identical content share a root tree; download it once
+        branch_trees = {}
+        for branch, sha in zip(heads.values(), pool.map(tree_sha, heads)):
+            if sha is not None:
+                branch_trees.setdefault(sha, branch)
+        trees = list(pool.map(fetch, branch_trees))
+
+    files = {}
+    for branch, tree in zip(branch_trees.values(), trees):
+        if tree is None:
+            continue
+        for item in tree.items:
+            key = (item["path"], item["sha"])
+            if item["type"] == "blob" and key not in files and wanted(item):
+                files[key] = RepoFile(item["path"], item["sha"], branch)
+    return list(files.values())
+
+
+def distinct_blobs(files):
+    """The first RepoFile of each blob SHA, for downloading or parsing each blob once."""
+    blobs = {}
+    for repo_file in files:
+        blobs.setdefault(repo_file.sha, repo_file)
+    return list(blobs.values())
+
+
+def download_blob(session, api_url, repo, sha, max_bytes=BLOB_MAX_BYTES, chunk_size=64 * 1024):
+    """Raw bytes (a bytearray) of blob `sha`, checked against the SHA.
+
+    Uses the blob endpoint with the raw media type: no base64/JSON wrapping,
+    and no 1 MB ceiling as on the contents API. The body is streamed in
+    chunks straight into one buffer, so only the raw bytes are held. Raises
+    requests.HTTPError on an HTTP failure and Exception if the blob is too
+    large or its content doesn't hash to `sha`.
+    """
+    url = f"{api_url}/repos/{repo}/git/blobs/{sha}"
+    with session.get(url, headers={"Accept": "application/vnd.github.raw"}, stream=True) as response:
+        response.raise_for_status()
+        content = bytearray()
+        for chunk in response.iter_content(chunk_size):
+            content += chunk
+            if len(content) > max_bytes:
+                raise Exception(f"Blob {sha} is larger than {max_bytes} bytes")
+
+    digest = hashlib.sha1(b"blob %d\0" % len(content))
+    digest.update(content)
+    if digest.hexdigest() != sha:
+        raise Exception(f"Blob {sha} failed verification: got {digest.hexdigest()}")
+    return content
@@ -0,0 +1,245 @@
+"""Persisted per-day, per-project resolution rollups for the trend routes.
+
+Each resolved issue contributes (project, resolution day, seconds to
+resolve) to a `resolutions` table; `rollups` holds, per project and day,
+the count, the summed seconds and a log-scale histogram sketch used for
+percentiles. `refresh` asks Jira only for issues updated since the last
+refresh (the first run backfills ROLLUP_DAYS of resolutions), and only the
+days those issues moved into or out of are re-aggregated. Trend requests
+then read the rollup rows; `current` refreshes first when the last refresh
+is older than ROLLUP_TTL seconds.
+
+Days are the calendar date of `resolutiondate` in its own UTC offset, as in
+trend_engine. Means are exact; percentiles are read from the sketch, within
+about 5% of the true value.
+"""
+import json
+import math
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import date, timedelta
+
+import numpy as np
+
+import issue_record
+import jira_fetch
+import jira_time
+import trend_engine
+
+# Days of resolutions loaded on the first refresh
+ROLLUP_DAYS = int(os.getenv("ROLLUP_DAYS", "365"))
+
+# Seconds a refresh is trusted before a trend request refreshes again
+ROLLUP_TTL = float(os.getenv("ROLLUP_TTL", "60"))
+
+# Seconds re-fetched on every refresh to cover clock skew between us and Jira
+SYNC_OVERLAP = 300
+
+# Histogram sketch: bin k covers [SKETCH_MIN * SKETCH_RATIO**k, SKETCH_MIN * SKETCH_RATIO**(k+1))
+SKETCH_MIN = 60.0
+SKETCH_RATIO = 1.1
+SKETCH_BINS = 160     # reaches past 2 years
+
+ROLLUP_FIELDS = "project,created,resolutiondate"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS resolutions (
+    key TEXT PRIMARY KEY,
+    project TEXT,
+    day TEXT,
+    seconds REAL,
+    bin INTEGER
+);
+CREATE TABLE IF NOT EXISTS rollups (
+    project TEXT,
+    day TEXT,
+    count INTEGER,
+    total_seconds REAL,
+    histogram TEXT,
+    PRIMARY KEY (project, day)
+);
+CREATE INDEX IF NOT EXISTS rollups_day ON rollups (day);
+CREATE TABLE IF NOT EXISTS rollup_state (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    last_sync REAL,
+    since TEXT
+);
+"""
+
+
+def sketch_bin(seconds):
+    if seconds <= SKETCH_MIN:
+        return 0
+    return min(int(math.log(seconds / SKETCH_MIN) / math.log(SKETCH_RATIO)), SKETCH_BINS - 1)
+
+
+def sketch_value(bin_number):
+    """Geometric midpoint of a sketch bin, in seconds."""
+    return SKETCH_MIN * SKETCH_RATIO ** (bin_number + 0.5)
+
+
+def sketch_percentile(histogram, q):
+    """Approximate percentile `q` of the values counted in `histogram` ({bin: count}).
+
+    Interpolates linearly between the two nearest ranks, as numpy.percentile
+    does, with each value read as its bin's midpoint.
+    """
+    total = sum(histogram.values())
+    if not total:
+        return 0.0
+    rank = q / 100.0 * (total - 1)
+    low, high = math.floor(rank), math.ceil(rank)
+    values = {}
+    seen = 0
+    for bin_number in sorted(histogram):
+        seen += histogram[bin_number]
+        for position in (low, high):
+            if position not in values and position < seen:
+                values[position] = sketch_value(bin_number)
+        if high in values:
+            break
+    return values[low] + (values[high] - values[low]) * (rank - low)
+
+
+def resolution_row(issue):
+    """(key, project, day, seconds, bin) for an IssueRecord, or None if it's unresolved."""
+    if not issue.created or not issue.resolved:
+        return None
+    seconds = jira_time.to_epoch(issue.resolved) - jira_time.to_epoch(issue.created)
+    return issue.key, issue.project, issue.resolved[:10], seconds, sketch_bin(seconds)
+
+
+class ResolutionRollups:
+    def __init__(self, path, ttl=ROLLUP_TTL):
+        self.path = path
+        self.ttl = ttl
+        self.refreshed = 0.0
+        self._refresh_lock = threading.Lock()
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _state(self):
+        with self._connect() as conn:
+            row = conn.execute("SELECT last_sync, since FROM rollup_state WHERE id = 0").fetchone()
+        return row or (None, None)
+
+    def last_sync(self):
+        return self._state()[0]
+
+    def covers(self, start):
+        """True if every day from `start` on is in the rollups (the backfill reached back that far)."""
+        since = self._state()[1]
+        return since is not None and start > date.fromisoformat(since)
+
+    def refresh(self, jira_url, auth, full=False):
+        """Fold issues resolved or changed since the last refresh into the rollups.
+
+        The whole refresh is one transaction: if a page fails, nothing is
+        written and the next refresh starts over from the same point.
+        """
+        with self._refresh_lock, self._connect() as conn:
+            started = time.time()
+            last_sync, since = (None, None) if full else self._state()
+            if last_sync is None:
+                # The backfill boundary day is only partly loaded; covers() excludes it
+                jql = f"resolved >= -{ROLLUP_DAYS}d"
+                since = (trend_engine.last_days(1)[1] - timedelta(days=ROLLUP_DAYS)).isoformat()
+                conn.execute("DELETE FROM resolutions")
+                conn.execute("DELETE FROM rollups")
+            else:
+                # Updated, not resolved: reopened issues must drop out too
+                minutes = int((started - last_sync + SYNC_OVERLAP) // 60) + 1
+                jql = f"updated >= -{minutes}m"
+
+            touched = set()
+            for page in jira_fetch.iter_issue_pages(jira_url, auth, jql, ROLLUP_FIELDS):
+                touched |= self._apply(conn, [issue_record.from_issue(issue) for issue in page])
+            self._reaggregate(conn, touched)
+            conn.execute("INSERT OR REPLACE INTO rollup_state VALUES (0, ?, ?)", (started, since))
+        self.refreshed = time.time()
+        return len(touched)
+
+    def current(self, jira_url, auth):
+        """Refresh if the last refresh is older than the TTL; returns self."""
+        if time.time() - self.refreshed >= self.ttl:
+            self.refresh(jira_url, auth)
+        return self
+
+    def _apply(self, conn, issues):
+        """Upsert or drop each IssueRecord's contribution; returns the (project, day) pairs that changed."""
+        keys = [issue.key for issue in issues]
+        touched = set()
+        marks = ",".join("?" * len(keys))
+        old = {row[0]: row for row in conn.execute(
+            f"SELECT key, project, day, seconds, bin FROM resolutions WHERE key IN ({marks})", keys)}
+        for issue in issues:
+            new = resolution_row(issue)
+            previous = old.get(issue.key)
+            if new == previous:
+                continue
+            if previous:
+                touched.add((previous[1], previous[2]))
+                conn.execute("DELETE FROM resolutions WHERE key = ?", (issue.key,))
+            if new:
+                touched.add((new[1], new[2]))
+                conn.execute("INSERT INTO resolutions VALUES (?, ?, ?, ?, ?)", new)
+        return touched
+
+    def _reaggregate(self, conn, touched):
+        for project, day in touched:
+            histogram = dict(conn.execute(
+                "SELECT bin, COUNT(*) FROM resolutions WHERE project IS ? AND day = ? GROUP BY bin",
+                (project, day)))
+            count, total = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(seconds), 0) FROM resolutions WHERE project IS ? AND day = ?",
+                (project, day)).fetchone()
+            if count:
+                conn.execute("INSERT OR REPLACE INTO rollups VALUES (?, ?, ?, ?, ?)",
+                             (project, day, count, total, json.dumps(histogram)))
+            else:
+                conn.execute("DELETE FROM rollups WHERE project IS ? AND day = ?", (project, day))
+
+    def trend(self, start, end, bucket="day", project=None, percentiles=(50, 90)):
+        """Same rows as trend_engine.trend, read from the rollups."""
+        starts = trend_engine.bucket_starts(start, end, bucket)
+        groups = [{"count": 0, "total": 0.0, "histogram": Counter()} for _ in starts]
+        query = "SELECT day, count, total_seconds, histogram FROM rollups WHERE day >= ? AND day <= ?"
+        params = [start.isoformat(), end.isoformat()]
+        if project is not None:
+            query += " AND project = ?"
+            params.append(project)
+        with self._connect() as conn:
+            rows = conn.execute(query, params).fetchall()
+
+        for day, count, total, histogram in rows:
+            group = groups[int(np.searchsorted(starts, np.datetime64(day, "D"), side="right")) - 1]
+            group["count"] += count
+            group["total"] += total
+            group["histogram"].update({int(b): c for b, c in json.loads(histogram).items()})
+
+        output = []
+        for day, group in zip(starts.tolist(), groups):
+            count = group["count"]
+            row = {
+                "date": day.isoformat(),
+                "avg_resolution_days": round(group["total"] / count / 86400, 2) if count else 0,
+                "resolved_count": count
+            }
+            for q in percentiles:
+                value = sketch_percentile(group["histogram"], q) / 86400 if count else 0
+                row[f"p{q}_resolution_days"] = round(value, 2) if count else 0
+            output.append(row)
+        return output
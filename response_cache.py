@@ -0,0 +1,176 @@
+"""In-process cache for the dashboard payloads, with stale-while-revalidate.
+
+Every open dashboard tab polls the same routes, and each poll used to
+scan Jira. A route's payload is now computed once and reused:
+
+  - younger than the route's TTL: served from the cache;
+  - older, but within CACHE_MAX_STALE seconds past the TTL: the cached
+    payload is served at once and one background refresh replaces it;
+  - missing or older than that: computed before answering.
+
+Concurrent misses are single-flight: the first caller computes and the
+rest wait for its result, so 50 tabs opening at once cost one Jira scan.
+A computation that raises is not cached; its waiters get the error.
+
+TTLs are per route, overridable with CACHE_TTL_<ROUTE>, e.g.
+CACHE_TTL_JIRA_SUMMARY=120. A TTL of 0 turns caching off for that route.
+Cached payloads are shared between requests, so callers must not mutate
+them.
+"""
+import asyncio
+import functools
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+# Default seconds a payload is served without refreshing, per route
+ROUTE_TTLS = {
+    "/jira-dashboard-task": 30,
+    "/jira-dashboard-all": 30,
+    "/jira-summary": 60,
+    "/resolution-trend": 300,
+}
+
+# Seconds past the TTL a payload may still be served while it's refreshed
+CACHE_MAX_STALE = float(os.getenv("CACHE_MAX_STALE", "600"))
+
+# Payloads kept per route (e.g. distinct /resolution-trend windows)
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "256"))
+
+REVALIDATE = ThreadPoolExecutor(max_workers=4, thread_name_prefix="revalidate")
+
+
+def route_ttl(route):
+    """TTL for `route`: CACHE_TTL_<ROUTE> if set, else ROUTE_TTLS."""
+    name = "CACHE_TTL_" + route.strip("/").upper().replace("-", "_").replace("/", "_")
+    return float(os.getenv(name, ROUTE_TTLS.get(route, 30)))
+
+
+class ResponseCache:
+    """Payloads keyed by the arguments they were computed from, for threaded servers."""
+
+    def __init__(self, ttl, max_stale=CACHE_MAX_STALE, max_entries=CACHE_MAX_ENTRIES, cache_if=None):
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.max_entries = max_entries
+        self.cache_if = cache_if
+        self._entries = {}   # key -> (payload, stored at)
+        self._flights = {}   # key -> Future of the computation in progress
+        self._lock = threading.Lock()
+
+    def _store(self, key, payload):
+        if self.cache_if is not None and not self.cache_if(payload):
+            return
+        self._entries[key] = (payload, time.monotonic())
+        if len(self._entries) > self.max_entries:
+            oldest = min(self._entries, key=lambda k: self._entries[k][1])
+            del self._entries[oldest]
+
+    def _age(self, entry):
+        return time.monotonic() - entry[1] if entry else None
+
+    def get(self, key, compute):
+        """Cached payload for `key`, calling compute() on a miss or to refresh."""
+        if self.ttl <= 0:
+            return compute()
+        with self._lock:
+            entry = self._entries.get(key)
+            age = self._age(entry)
+            if entry and age < self.ttl:
+                return entry[0]
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = Future()
+            if entry and age < self.ttl + self.max_stale:
+                if leader:
+                    REVALIDATE.submit(self._revalidate, key, compute, flight)
+                return entry[0]
+        if leader:
+            self._run(key, compute, flight)
+        return flight.result()
+
+    def _run(self, key, compute, flight):
+        try:
+            payload = compute()
+        except Exception as e:
+            with self._lock:
+                del self._flights[key]
+            flight.set_exception(e)
+            return
+        with self._lock:
+            self._store(key, payload)
+            del self._flights[key]
+        flight.set_result(payload)
+
+    def _revalidate(self, key, compute, flight):
+        self._run(key, compute, flight)
+        if flight.exception() is not None:
+            # Keep serving the stale payload; the next request retries
+            print("Error:", flight.exception())
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class AsyncResponseCache(ResponseCache):
+    """The same cache for asyncio servers; compute is a coroutine function."""
+
+    async def get(self, key, compute):
+        if self.ttl <= 0:
+            return await compute()
+        entry = self._entries.get(key)
+        age = self._age(entry)
+        if entry and age < self.ttl:
+            return entry[0]
+        stale = entry is not None and age < self.ttl + self.max_stale
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = self._flights[key] = asyncio.ensure_future(self._run(key, compute))
+            if stale:
+                flight.add_done_callback(self._log_failure)
+        if stale:
+            return entry[0]
+        # A client going away must not cancel the scan other callers wait on
+        return await asyncio.shield(flight)
+
+    async def _run(self, key, compute):
+        try:
+            payload = await compute()
+            self._store(key, payload)
+            return payload
+        finally:
+            del self._flights[key]
+
+    @staticmethod
+    def _log_failure(flight):
+        if not flight.cancelled() and flight.exception() is not None:
+            print("Error:", flight.exception())
+
+
+def cached(route, cache_if=None):
+    """Cache a payload function for `route`, keyed by its arguments."""
+    def decorate(fn):
+        cache = ResponseCache(route_ttl(route), cache_if=cache_if)
+
+        @functools.wraps(fn)
+        def wrapper(*args):
+            return cache.get(args, lambda: fn(*args))
+        wrapper.cache = cache
+        return wrapper
+    return decorate
+
+
+def cached_async(route):
+    """cached() for coroutine functions."""
+    def decorate(fn):
+        cache = AsyncResponseCache(route_ttl(route))
+
+        @functools.wraps(fn)
+        async def wrapper(*args):
+            return await cache.get(args, lambda: fn(*args))
+        wrapper.cache = cache
+        return wrapper
+    return decorate
@@ -0,0 +1,184 @@
+"""SQLite FTS5 full-text index over repository documents, keyed by blob SHA.
+
+Each distinct blob is indexed once. `update` is given the repo's current
+files plus text for any blob not indexed yet; it adds those, drops blobs
+no longer in the repo, and refreshes the paths/branches each blob is shown
+under (every path holding the blob is listed). Searches return BM25-ranked
+snippets straight from the index.
+
+DocumentSearch keeps an index in step with a repo for the /search routes:
+a stale index is refreshed on a background thread while searches answer
+from what is already indexed.
+"""
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+import extract_pool
+import repo_files
+
+# Seconds before a search checks the repo for new documents again
+SEARCH_INDEX_TTL = float(os.getenv("SEARCH_INDEX_TTL", "60"))
+# Most results one search returns
+SEARCH_MAX_LIMIT = int(os.getenv("SEARCH_MAX_LIMIT", "50"))
+
+SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS docs USING fts5(sha UNINDEXED, text, tokenize = 'porter unicode61');
+DROP TABLE IF EXISTS doc_files;
+CREATE TABLE IF NOT EXISTS doc_paths (
+    sha TEXT,
+    path TEXT,
+    branch TEXT,
+    PRIMARY KEY (sha, path)
+);
+"""
+
+
+def match_query(query):
+    """FTS5 query matching every word of `query`, with FTS5 syntax characters taken literally."""
+    return " ".join('"' + word.replace('"', '""') + '"' for word in query.split())
+
+
+class SearchIndex:
+    def __init__(self, path):
+        self.path = path
+        self.refreshed = 0.0
+        self._write_lock = threading.Lock()
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def empty(self):
+        """True until some document has been indexed."""
+        with self._connect() as conn:
+            return conn.execute("SELECT 1 FROM doc_paths LIMIT 1").fetchone() is None
+
+    def indexed(self):
+        """Blob SHAs already in the index."""
+        with self._connect() as conn:
+            return {sha for sha, in conn.execute("SELECT sha FROM docs")}
+
+    def update(self, files, texts):
+        """Sync the index with `files` (RepoFiles); `texts` maps new blob SHAs to their text.
+
+        Files whose blob isn't indexed and has no text yet are left out
+        until a later update supplies it.
+        """
+        current = {f.sha for f in files}
+        with self._write_lock, self._connect() as conn:
+            indexed = {sha for sha, in conn.execute("SELECT sha FROM docs")}
+            conn.executemany("DELETE FROM docs WHERE sha = ?", [(sha,) for sha in indexed - current])
+            conn.executemany("INSERT INTO docs (sha, text) VALUES (?, ?)",
+                             [(sha, text) for sha, text in texts.items()
+                              if sha in current and sha not in indexed])
+            conn.execute("DELETE FROM doc_paths")
+            conn.executemany("INSERT OR IGNORE INTO doc_paths VALUES (?, ?, ?)",
+                             [(f.sha, f.path, f.branch) for f in files])
+        self.refreshed = time.time()
+
+    def search(self, query, limit=10):
+        """[{path, branch, snippet, score}], best match (highest score, i.e. -BM25) first."""
+        terms = match_query(query)
+        if not terms:
+            return []
+        # SQLite reads LIMIT -1 as no limit
+        limit = max(1, min(limit, SEARCH_MAX_LIMIT))
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT doc_paths.path, doc_paths.branch,"
+                " snippet(docs, 1, '[', ']', '...', 16), bm25(docs)"
+                " FROM docs JOIN doc_paths ON doc_paths.sha = docs.sha"
+                " WHERE docs MATCH ? ORDER BY bm25(docs), doc_paths.path LIMIT ?",
+                (terms, limit)).fetchall()
+        return [{"path": path, "branch": branch, "snippet": snippet, "score": round(-score, 4)}
+                for path, branch, snippet, score in rows]
+
+
+class DocumentSearch:
+    """Answers searches from `index`, refreshing it from the repo in the background.
+
+    `list_files()` returns the repo's current RepoFiles; blobs not indexed
+    yet get their text from `text_cache` or, failing that, from
+    `extractor.map(..., download, extract)`.
+    """
+
+    def __init__(self, index, list_files, text_cache, extractor, download, extract, ttl=SEARCH_INDEX_TTL):
+        self.index = index
+        self.list_files = list_files
+        self.text_cache = text_cache
+        self.extractor = extractor
+        self.download = download
+        self.extract = extract
+        self.ttl = ttl
+        self._refresh_lock = threading.Lock()
+
+    def refresh(self):
+        """Index the text of every blob not indexed yet; skipped while another refresh runs."""
+        if not self._refresh_lock.acquire(blocking=False):
+            return
+        try:
+            files = self.list_files()
+            indexed = self.index.indexed()
+            missing = [f for f in repo_files.distinct_blobs(files) if f.sha not in indexed]
+            texts = self.text_cache.get_many([f.sha for f in missing], "text")
+            to_parse = [f for f in missing if f.sha not in texts]
+            parsed = self.extractor.map(to_parse, self.download, self.extract)
+            for repo_file, text in zip(to_parse, parsed):
+                if text is None or text is extract_pool.TIMED_OUT:
+                    continue  # retried on the next refresh
+                if text is extract_pool.CRASHED:
+                    text = ""  # indexed as empty, like a file that fails to parse
+                if text:
+                    self.text_cache.put(repo_file.sha, "text", text)
+                texts[repo_file.sha] = text
+            self.index.update(files, texts)
+        finally:
+            self._refresh_lock.release()
+
+    def refreshing(self):
+        return self._refresh_lock.locked()
+
+    def refresh_in_background(self):
+        """Start refresh() on a daemon thread unless one is already running."""
+        if self.refreshing():
+            return
+
+        def run():
+            try:
+                self.refresh()
+            except Exception as e:
+                print("Error:", e)
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def respond(self, args):
+        """(payload, status) for a /search request with args `q` and `limit`."""
+        query = args.get("q", "").strip()
+        if not query:
+            return {"error": "q is required"}, 400
+        limit = args.get("limit", 10, type=int)
+
+        # Answer from the current index; new documents show up once the refresh lands
+        if time.time() - self.index.refreshed > self.ttl:
+            self.refresh_in_background()
+        if not self.index.refreshed and self.index.empty():
+            # Cold start: no results yet wouldn't mean no matches
+            return {"error": "Search index is being built, try again shortly", "indexing": True}, 503
+
+        output = []
+        for result in self.index.search(query, limit):
+            output.append({
+                "file_name": os.path.basename(result["path"]),
+                **result
+            })
+        return output, 200
@@ -0,0 +1,108 @@
+import os
+import threading
+import time
+
+import extract_pool
+
+
+def parse(value):
+    if value == "hang":
+        time.sleep(60)
+    if value == "fail":
+        raise ValueError("bad file")
+    if value == "crash":
+        os._exit(1)
+    return value.upper()
+
+
+def download(value):
+    return (value,)
+
+
+def test_timeout_isolates_the_stuck_file():
+    pool = extract_pool.ExtractPool(workers=1, download_workers=2, timeout=1)
+    try:
+        start = time.monotonic()
+        results = list(pool.map(["a", "hang", "b", "c", "d", "e"], download, parse))
+        elapsed = time.monotonic() - start
+    finally:
+        pool.close()
+    assert results == ["A", extract_pool.TIMED_OUT, "B", "C", "D", "E"]
+    assert elapsed < 4
+
+
+def test_download_none_and_parse_errors():
+    pool = extract_pool.ExtractPool(workers=1, download_workers=1, timeout=5)
+    try:
+        assert list(pool.map(["a", None], lambda v: None if v is None else (v,), parse)) == ["A", None]
+        try:
+            list(pool.map(["fail"], download, parse))
+        except ValueError as e:
+            assert str(e) == "bad file"
+        else:
+            raise AssertionError("parse error was swallowed")
+        # The worker that raised is still usable
+        assert list(pool.map(["z"], download, parse)) == ["Z"]
+    finally:
+        pool.close()
+
+
+def test_concurrent_maps_survive_a_timeout():
+    pool = extract_pool.ExtractPool(workers=2, download_workers=2, timeout=1)
+    results = {}
+
+    def listing(name, values):
+        results[name] = list(pool.map(values, download, parse))
+
+    try:
+        threads = [threading.Thread(target=listing, args=("stuck", ["hang", "x"])),
+                   threading.Thread(target=listing, args=("other", ["p", "q", "r", "s"]))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        pool.close()
+    assert results == {"stuck": [extract_pool.TIMED_OUT, "X"], "other": ["P", "Q", "R", "S"]}
+
+
+def test_downloads_are_bounded():
+    pool = extract_pool.ExtractPool(workers=1, download_workers=2, timeout=5)
+    downloaded = []
+
+    def counting_download(value):
+        downloaded.append(value)
+        return (value,)
+
+    try:
+        results = pool.map([str(n) for n in range(50)], counting_download, parse)
+        assert next(results) == "0"
+        time.sleep(0.5)
+        # 3 in flight ahead of the caller, plus the one refilled after the first result
+        assert len(downloaded) <= 4
+        assert len(list(results)) == 49
+    finally:
+        pool.close()
+
+
+def test_crash_is_reported_separately():
+    pool = extract_pool.ExtractPool(workers=1, download_workers=1, timeout=5)
+    try:
+        assert list(pool.map(["a", "crash", "b"], download, parse)) == ["A", extract_pool.CRASHED, "B"]
+    finally:
+        pool.close()
+
+
+def test_close_kills_busy_workers():
+    pool = extract_pool.ExtractPool(workers=2, download_workers=2, timeout=30)
+    results = []
+    thread = threading.Thread(target=lambda: results.extend(pool.map(["hang", "hang"], download, parse)))
+    thread.start()
+    time.sleep(1)
+    processes = [worker.process for worker in pool._workers]
+    assert len(processes) == 2
+    pool.close()
+    thread.join(10)
+    assert not thread.is_alive()
+    assert not any(process.is_alive() for process in processes)
+    assert not pool._workers
@@ -0,0 +1,53 @@
+import os
+import threading
+import time
+
+import file_index
+import http_client
+from github_stub import GitHubStub
+
+
+def make_index(stub, tmp_path, **kwargs):
+    return file_index.FileIndex(str(tmp_path / "index.db"), http_client.github_session({}), stub.url,
+                                "owner/repo", lambda item: item["path"].endswith(".txt"), **kwargs)
+
+
+def test_misses_refresh_at_most_once_per_interval(tmp_path):
+    branches = {"main": {"docs/a.txt": b"a"}}
+    with GitHubStub(branches) as stub:
+        index = make_index(stub, tmp_path, miss_interval=0.5)
+        assert index.find("a.txt").path == "docs/a.txt"
+        assert stub.calls["branches"] == 1
+
+        for _ in range(20):
+            assert index.find("missing.txt") is None
+        assert stub.calls["branches"] == 1
+
+        # Once the interval has passed, a miss picks up new files
+        branches["main"]["docs/b.txt"] = b"b"
+        time.sleep(0.6)
+        assert index.find("b.txt").path == "docs/b.txt"
+        assert index.find("nope.txt") is None
+        assert stub.calls["branches"] == 2
+
+
+def test_first_branch_listed_wins(tmp_path):
+    branches = {"main": {"a.txt": b"main"}, "dev": {"docs/a.txt": b"dev", "c.txt": b"c"}}
+    with GitHubStub(branches) as stub:
+        index = make_index(stub, tmp_path)
+        found = index.find("a.txt")
+        assert (found.branch, found.path) == ("main", "a.txt")
+        assert os.path.basename(index.find("c.txt").path) == "c.txt"
+
+
+def test_concurrent_lookups_after_the_ttl_refresh_once(tmp_path):
+    with GitHubStub({"main": {"a.txt": b"a"}}, latency=0.1) as stub:
+        index = make_index(stub, tmp_path, ttl=0.3)
+        index.find("a.txt")
+        time.sleep(0.4)
+        threads = [threading.Thread(target=index.find, args=("a.txt",)) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert stub.calls["branches"] == 2
@@ -0,0 +1,35 @@
+import importlib
+
+import pytest
+
+import github_history
+from github_stub import GitHubStub
+
+
+@pytest.fixture
+def github(monkeypatch, tmp_path):
+    branches = {"main": {"docs/report_2024.pdf": b"a"},
+                "release": {"docs/report_2024.pdf": b"a", "docs/report_2025.docx": b"b", "docs/other.txt": b"c"}}
+    messages = {"docs/report_2025.docx": "Add 2025 report\n\nQuarterly numbers"}
+    with GitHubStub(branches, messages) as stub:
+        monkeypatch.setenv("GITHUB_API_URL", stub.url)
+        monkeypatch.setenv("GITHUB_REPO", "owner/repo")
+        monkeypatch.setenv("GITHUB_BRANCH", "release")
+        monkeypatch.chdir(tmp_path)
+        yield importlib.reload(importlib.import_module("github")), stub
+
+
+def test_related_docs_batch_history_on_the_default_branch(github):
+    module, stub = github
+    response = module.app.test_client().post("/get_related_docs", json={"file_name": "report.pdf"})
+    assert response.get_json() == [
+        {"file_name": "report_2024.pdf", "description": "Description of docs/report_2024.pdf"},
+        {"file_name": "report_2025.docx", "description": "Quarterly numbers"}]
+    assert stub.calls["graphql"] == 1
+    assert stub.calls["commits"] == 0
+
+
+def test_history_query_targets():
+    assert "defaultBranchRef" in github_history.build_query(1, ref=False)
+    assert "$ref" not in github_history.build_query(1, ref=False)
+    assert "object(expression: $ref)" in github_history.build_query(1)
@@ -0,0 +1,86 @@
+import importlib
+import time
+
+import pytest
+
+import search_index
+from github_stub import GitHubStub
+
+
+@pytest.fixture
+def hub(monkeypatch, tmp_path):
+    branches = {"main": {"docs/guide.txt": b"deploy the dashboard with hypercorn",
+                         "docs/notes.txt": b"jira tokens live in board.env"}}
+    with GitHubStub(branches, latency=0.3) as stub:
+        monkeypatch.setenv("GITHUB_API_URL", stub.url)
+        monkeypatch.setenv("GITHUB_REPO_OWNER", "owner")
+        monkeypatch.setenv("GITHUB_REPO_NAME", "repo")
+        monkeypatch.chdir(tmp_path)
+        module = importlib.reload(importlib.import_module("hub"))
+        try:
+            yield module, stub
+        finally:
+            module.EXTRACTOR.close()
+
+
+def search(client, query, **args):
+    return client.get("/search", query_string={"q": query, **args})
+
+
+def wait_for_index(module):
+    deadline = time.monotonic() + 10
+    while not module.SEARCH.refreshed and time.monotonic() < deadline:
+        time.sleep(0.05)
+
+
+def test_cold_start_answers_503_until_the_index_is_built(hub):
+    module, stub = hub
+    client = module.app.test_client()
+
+    start = time.monotonic()
+    response = search(client, "hypercorn")
+    assert time.monotonic() - start < 0.3
+    assert response.status_code == 503
+    assert response.get_json()["indexing"] is True
+
+    wait_for_index(module)
+    response = search(client, "hypercorn")
+    assert response.status_code == 200
+    assert [row["file_name"] for row in response.get_json()] == ["guide.txt"]
+    assert search(client, "nothing-matches").get_json() == []
+
+
+def test_stale_index_answers_while_refreshing(hub):
+    module, stub = hub
+    client = module.app.test_client()
+    search(client, "jira")
+    wait_for_index(module)
+
+    module.DOCUMENT_SEARCH.ttl = 0
+    start = time.monotonic()
+    response = search(client, "jira")
+    assert time.monotonic() - start < 0.3
+    assert [row["file_name"] for row in response.get_json()] == ["notes.txt"]
+
+
+def test_concurrent_stale_searches_start_one_refresh(hub):
+    module, stub = hub
+    client = module.app.test_client()
+    for _ in range(5):
+        search(client, "jira")
+    wait_for_index(module)
+    assert stub.calls["branches"] == 1
+
+
+def test_limit_is_clamped(tmp_path):
+    index = search_index.SearchIndex(str(tmp_path / "search.db"))
+    files = [search_index.repo_files.RepoFile(f"doc{n}.txt", f"s{n}", "main") for n in range(60)]
+    index.update(files, {f.sha: "common words" for f in files})
+    assert len(index.search("common", -1)) == 1
+    assert len(index.search("common", 0)) == 1
+    assert len(index.search("common", 1000)) == search_index.SEARCH_MAX_LIMIT
+
+
+def test_missing_query_is_a_400(hub):
+    module, stub = hub
+    assert module.app.test_client().get("/search").status_code == 400
@@ -0,0 +1,69 @@
+import pytest
+
+import issue_store
+import jira_fetch
+from jira_stub import JiraStub
+
+AUTH = ("u", "t")
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    monkeypatch.setattr(jira_fetch, "RETRY_BACKOFF", 0)
+    with JiraStub(total=300, latency=0.0) as stub:
+        yield stub
+
+
+@pytest.fixture
+def store(tmp_path):
+    return issue_store.IssueStore(str(tmp_path / "issues.db"))
+
+
+def keys(store, **filters):
+    return {issue.key for issue in store.issues(**filters)}
+
+
+def test_incremental_sync_fetches_only_changed_issues(stub, store):
+    assert store.sync(stub.url, AUTH) == 300
+    first = store.last_sync("")
+
+    assert store.sync(stub.url, AUTH) == 0
+    stub.touch(4, 7)
+    assert store.sync(stub.url, AUTH) == 2
+    assert store.last_sync("") > first
+    assert len(keys(store)) == 300
+
+
+def test_records_match_the_stub(stub, store):
+    store.sync(stub.url, AUTH, "project=BETA")
+    records = {issue.key: issue for issue in store.issues(project="BETA")}
+    assert len(records) == 100
+    issue = records["BETA-1"]
+    assert (issue.project, issue.type, issue.status, issue.priority) == ("BETA", "Bug", "In Progress", "High")
+    assert issue.resolved == "2025-01-01T03:00:00.000+0000"
+    assert keys(store, project="BETA", issuetype="Test Case") == {
+        key for key, issue in records.items() if issue.type == "Test Case"}
+
+
+def test_full_sync_drops_vanished_issues_in_scope_only(stub, store):
+    store.sync(stub.url, AUTH, "project=ALPHA")
+    store.sync(stub.url, AUTH, "project=BETA")
+    stub.total = 150
+    assert store.sync(stub.url, AUTH, "project=ALPHA", full=True) == 50
+    assert len(keys(store, project="ALPHA")) == 50
+    assert len(keys(store, project="BETA")) == 100
+
+
+def test_failed_sync_keeps_rows_and_sync_mark(stub, store):
+    store.sync(stub.url, AUTH)
+    last_sync = store.last_sync("")
+
+    stub.fail_rate = 1.0
+    with pytest.raises(Exception):
+        store.sync(stub.url, AUTH, full=True)
+    assert store.last_sync("") == last_sync
+    assert len(keys(store)) == 300
+
+    stub.fail_rate = 0.0
+    stub.touch(1)
+    assert store.sync(stub.url, AUTH) == 1
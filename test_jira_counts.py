@@ -0,0 +1,41 @@
+import threading
+import time
+
+import pytest
+
+import jira_counts
+from jira_stub import JiraStub
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    monkeypatch.setattr(jira_counts, "_metadata", {})
+    with JiraStub(total=30, latency=0.3) as stub:
+        yield stub
+
+
+def test_metadata_endpoints_are_fetched_concurrently_and_cached(stub):
+    auth = ("u", "t")
+    lookups = [jira_counts.get_statuses, jira_counts.get_priorities, jira_counts.get_issue_types]
+    results = {}
+    threads = [threading.Thread(target=lambda f=f: results.update({f.__name__: f(stub.url, auth)}))
+               for f in lookups]
+    start = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert time.monotonic() - start < 0.8
+    assert results["get_issue_types"] == ["Task", "Bug", "Test Case"]
+    assert stub.requests == 3
+
+    assert jira_counts.get_statuses(stub.url, auth)[0] == "To Do"
+    assert stub.requests == 3
+
+
+def test_metadata_errors_are_not_cached(stub):
+    stub.fail_rate = 1.0
+    with pytest.raises(Exception):
+        jira_counts.get_statuses(stub.url, ("u", "t"))
+    stub.fail_rate = 0.0
+    assert "Done" in jira_counts.get_statuses(stub.url, ("u", "t"))
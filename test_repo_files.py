@@ -0,0 +1,38 @@
+import http_client
+import repo_files
+import search_index
+import tree_cache
+from github_stub import GitHubStub
+
+REPO = "owner/repo"
+
+
+def txt(item):
+    return item["path"].endswith(".txt")
+
+
+def test_crawl_downloads_each_tree_once_and_keeps_every_path(monkeypatch):
+    monkeypatch.setattr(tree_cache, "TREES", tree_cache.TreeCache())
+    template = b"same template"
+    main = {"a/template.txt": template, "b/template.txt": template, "notes.txt": b"v1"}
+    branches = {"main": main, "copy1": dict(main), "copy2": dict(main),
+                "dev": {"notes.txt": b"v2", "a/template.txt": template}}
+    with GitHubStub(branches) as stub:
+        files = repo_files.crawl(http_client.github_session({}), stub.url, REPO, txt)
+        assert stub.calls["commit"] == 4
+        assert stub.calls["tree"] == 2
+
+    assert sorted((f.path, f.branch) for f in files) == [
+        ("a/template.txt", "main"), ("b/template.txt", "main"), ("notes.txt", "dev"), ("notes.txt", "main")]
+    blobs = repo_files.distinct_blobs(files)
+    assert len(blobs) == 3
+    assert {f.sha for f in blobs} == {f.sha for f in files}
+
+
+def test_search_lists_every_path_of_a_blob(tmp_path):
+    files = [repo_files.RepoFile("a/template.txt", "s1", "main"),
+             repo_files.RepoFile("b/template.txt", "s1", "main"),
+             repo_files.RepoFile("notes.txt", "s2", "main")]
+    index = search_index.SearchIndex(str(tmp_path / "search.db"))
+    index.update(files, {"s1": "quarterly report template", "s2": "meeting notes"})
+    assert [row["path"] for row in index.search("template")] == ["a/template.txt", "b/template.txt"]
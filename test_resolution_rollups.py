@@ -0,0 +1,119 @@
+from datetime import date
+
+import pytest
+
+import jira_fetch
+import resolution_rollups
+import trend_engine
+from jira_stub import JiraStub
+
+DAY = date(2025, 3, 1)
+
+
+def issue(key, created, resolved, project="ALPHA"):
+    return {"key": key, "fields": {"project": {"key": project}, "created": created, "resolutiondate": resolved}}
+
+
+class Pages:
+    """Stands in for jira_fetch.iter_issue_pages, replaying scripted pages."""
+
+    def __init__(self):
+        self.pages = []
+        self.fail_after = None
+        self.queries = []
+
+    def __call__(self, jira_url, auth, jql, fields, **kwargs):
+        self.queries.append(jql)
+        for number, page in enumerate(self.pages):
+            if self.fail_after is not None and number >= self.fail_after:
+                raise Exception("Jira API error: 503")
+            yield page
+
+
+@pytest.fixture
+def pages(monkeypatch):
+    fake = Pages()
+    monkeypatch.setattr(jira_fetch, "iter_issue_pages", fake)
+    return fake
+
+
+@pytest.fixture
+def rollups(tmp_path):
+    return resolution_rollups.ResolutionRollups(str(tmp_path / "rollups.db"))
+
+
+def day_row(rollups):
+    return rollups.trend(DAY, DAY)[0]
+
+
+def test_incremental_refresh_moves_and_drops_issues(pages, rollups):
+    pages.pages = [[issue("A-1", "2025-03-01T00:00:00.000+0000", "2025-03-01T01:00:00.000+0000"),
+                    issue("A-2", "2025-02-28T00:00:00.000+0000", "2025-03-01T00:00:00.000+0000")]]
+    rollups.refresh("url", None)
+    assert pages.queries[-1].startswith("resolved >=")
+    assert day_row(rollups)["resolved_count"] == 2
+
+    # A-1 takes longer, A-2 is reopened
+    pages.pages = [[issue("A-1", "2025-03-01T00:00:00.000+0000", "2025-03-01T05:00:00.000+0000"),
+                    issue("A-2", "2025-02-28T00:00:00.000+0000", None)]]
+    assert rollups.refresh("url", None) == 1
+    assert pages.queries[-1].startswith("updated >=")
+    row = day_row(rollups)
+    assert row["resolved_count"] == 1
+    assert row["avg_resolution_days"] == round(5 / 24, 2)
+
+
+def test_failed_refresh_is_rolled_back_and_recovered(pages, rollups):
+    pages.pages = [[issue("A-1", "2025-03-01T00:00:00.000+0000", "2025-03-01T01:00:00.000+0000")]]
+    rollups.refresh("url", None)
+    last_sync = rollups.last_sync()
+
+    # The first page changes A-1, then the second page fails
+    pages.pages = [[issue("A-1", "2025-03-01T00:00:00.000+0000", "2025-03-01T05:00:00.000+0000")],
+                   [issue("A-9", "2025-03-01T00:00:00.000+0000", "2025-03-01T02:00:00.000+0000")]]
+    pages.fail_after = 1
+    with pytest.raises(Exception):
+        rollups.refresh("url", None)
+    assert rollups.last_sync() == last_sync
+    assert day_row(rollups)["avg_resolution_days"] == round(1 / 24, 2)
+
+    pages.fail_after = None
+    rollups.refresh("url", None)
+    row = day_row(rollups)
+    assert row["resolved_count"] == 2
+    assert row["avg_resolution_days"] == round((5 + 2) / 2 / 24, 2)
+
+
+def test_failed_backfill_keeps_nothing(pages, rollups):
+    pages.pages = [[issue("A-1", "2025-03-01T00:00:00.000+0000", "2025-03-01T01:00:00.000+0000")], []]
+    pages.fail_after = 1
+    with pytest.raises(Exception):
+        rollups.refresh("url", None)
+    assert rollups.last_sync() is None
+    assert day_row(rollups)["resolved_count"] == 0
+
+
+def test_rollups_match_trend_engine_on_the_stub(tmp_path):
+    with JiraStub(total=900, latency=0.0) as stub:
+        rollups = resolution_rollups.ResolutionRollups(str(tmp_path / "rollups.db"))
+        rollups.refresh(stub.url, ("u", "t"))
+        issues = jira_fetch.fetch_all_records(stub.url, ("u", "t"), "", "project,created,resolutiondate")
+
+    start, end = date(2025, 1, 1), date(2025, 2, 15)
+    _, resolved, seconds = trend_engine.resolution_columns(issues)
+    expected = trend_engine.trend(resolved, seconds / 86400, start, end, "week")
+    found = rollups.trend(start, end, "week")
+    assert [row["resolved_count"] for row in found] == [row["resolved_count"] for row in expected]
+    for want, got in zip(expected, found):
+        assert abs(want["avg_resolution_days"] - got["avg_resolution_days"]) <= 0.011
+        for name in ("p50_resolution_days", "p90_resolution_days"):
+            assert got[name] == pytest.approx(want[name], rel=0.06)
+
+
+def test_sketch_percentile_interpolates_between_ranks():
+    histogram = {resolution_rollups.sketch_bin(3600): 1, resolution_rollups.sketch_bin(7200): 1}
+    low = resolution_rollups.sketch_percentile(histogram, 0)
+    high = resolution_rollups.sketch_percentile(histogram, 100)
+    assert low == pytest.approx(3600, rel=0.05)
+    assert high == pytest.approx(7200, rel=0.05)
+    assert resolution_rollups.sketch_percentile(histogram, 50) == pytest.approx((low + high) / 2)
@@ -0,0 +1,161 @@
+import asyncio
+import importlib
+import os
+import threading
+import time
+
+import pytest
+
+import jira_fetch
+import response_cache
+from jira_stub import JiraStub
+
+
+class Counting:
+    """compute() stand-in that counts calls and can be made to fail."""
+
+    def __init__(self, delay=0.0):
+        self.calls = 0
+        self.delay = delay
+        self.fail = False
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        with self._lock:
+            self.calls += 1
+            calls = self.calls
+        time.sleep(self.delay)
+        if self.fail:
+            raise Exception("Jira API error: 503")
+        return {"calls": calls}
+
+
+def test_concurrent_misses_compute_once():
+    cache = response_cache.ResponseCache(ttl=60)
+    compute = Counting(delay=0.2)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get("k", compute))) for _ in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert compute.calls == 1
+    assert results == [{"calls": 1}] * 20
+
+
+def test_errors_reach_every_waiter_and_are_not_cached():
+    cache = response_cache.ResponseCache(ttl=60)
+    compute = Counting(delay=0.2)
+    compute.fail = True
+    errors = []
+
+    def get():
+        try:
+            cache.get("k", compute)
+        except Exception as e:
+            errors.append(str(e))
+
+    threads = [threading.Thread(target=get) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == ["Jira API error: 503"] * 5
+    assert compute.calls == 1
+
+    compute.fail = False
+    assert cache.get("k", compute) == {"calls": 2}
+
+
+def settle(cache, key):
+    """Wait for the background refresh of `key`, if one is running."""
+    flight = cache._flights.get(key)
+    if flight is not None:
+        flight.exception()
+
+
+def test_stale_payload_survives_a_failed_revalidation():
+    cache = response_cache.ResponseCache(ttl=0.2, max_stale=60)
+    compute = Counting()
+    assert cache.get("k", compute) == {"calls": 1}
+    time.sleep(0.25)
+
+    compute.fail = True
+    assert cache.get("k", compute) == {"calls": 1}   # stale, refresh runs in the background
+    settle(cache, "k")
+    assert cache.get("k", compute) == {"calls": 1}   # the failed refresh left it in place
+    settle(cache, "k")
+
+    compute.fail = False
+    assert cache.get("k", compute) == {"calls": 1}
+    settle(cache, "k")
+    assert cache.get("k", compute) == {"calls": 4}
+
+
+def test_cache_if_rejects_payloads():
+    cache = response_cache.ResponseCache(ttl=60, cache_if=lambda data: isinstance(data, list))
+    assert cache.get("k", lambda: ({"error": "x"}, 401)) == ({"error": "x"}, 401)
+    assert cache.get("k", lambda: [1]) == [1]
+    assert cache.get("k", lambda: [2]) == [1]
+
+
+def test_ttl_zero_disables_caching():
+    cache = response_cache.ResponseCache(ttl=0)
+    compute = Counting()
+    cache.get("k", compute)
+    cache.get("k", compute)
+    assert compute.calls == 2
+
+
+def test_async_single_flight_and_errors():
+    cache = response_cache.AsyncResponseCache(ttl=60)
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.1)
+        if len(calls) == 1:
+            raise Exception("Jira API error: 503")
+        return len(calls)
+
+    async def main():
+        first = await asyncio.gather(*(cache.get("k", compute) for _ in range(10)), return_exceptions=True)
+        assert [str(e) for e in first] == ["Jira API error: 503"] * 10
+        second = await asyncio.gather(*(cache.get("k", compute) for _ in range(10)))
+        assert second == [2] * 10
+
+    asyncio.run(main())
+    assert len(calls) == 2
+
+
+@pytest.fixture
+def board5(monkeypatch, tmp_path):
+    with JiraStub(total=300, latency=0.0) as stub:
+        monkeypatch.setenv("JIRA_URL", stub.url)
+        monkeypatch.setenv("JIRA_USER", "u")
+        monkeypatch.setenv("JIRA_TOKEN", "t")
+        monkeypatch.delenv("JIRA_STORE", raising=False)
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr(jira_fetch, "RETRY_BACKOFF", 0)
+        module = importlib.reload(importlib.import_module("board5"))
+        yield module, stub
+
+
+def test_outage_is_not_cached(board5):
+    module, stub = board5
+    client = module.app.test_client()
+
+    stub.fail_rate = 1.0
+    assert client.get("/jira-dashboard-all").get_json()["total_tasks"] == 0
+
+    stub.fail_rate = 0.0
+    healthy = client.get("/jira-dashboard-all").get_json()
+    assert healthy["total_tasks"] > 0
+
+    # An outage during a background refresh keeps the last good payload
+    module.dashboard_all.cache.ttl = 0.05
+    time.sleep(0.1)
+    stub.fail_rate = 1.0
+    assert client.get("/jira-dashboard-all").get_json() == healthy
+    time.sleep(0.2)
+    assert client.get("/jira-dashboard-all").get_json() == healthy
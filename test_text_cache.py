@@ -0,0 +1,36 @@
+import sqlite3
+
+import text_cache
+
+
+def stored_total(cache):
+    with cache._connect() as conn:
+        return (conn.execute("SELECT total FROM texts_size").fetchone()[0],
+                conn.execute("SELECT COALESCE(SUM(size), 0) FROM texts").fetchone()[0])
+
+
+def test_running_total_tracks_puts_replacements_and_evictions(tmp_path):
+    cache = text_cache.TextCache(str(tmp_path / "texts.db"), max_bytes=100)
+    cache.put("a", "text", "x" * 40)
+    cache.put("b", "text", "y" * 40)
+    cache.put("a", "text", "z" * 10)          # replaced, smaller
+    assert stored_total(cache) == (50, 50)
+    assert cache.get("a", "text") == "z" * 10
+
+    cache.get("a", "text")                     # b is now least recently used
+    cache.put("c", "text", "w" * 60)
+    total, actual = stored_total(cache)
+    assert total == actual <= 100
+    assert cache.get("b", "text") is None
+    assert cache.get("a", "text") == "z" * 10
+
+
+def test_existing_cache_gets_its_total_on_open(tmp_path):
+    path = str(tmp_path / "texts.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE texts (sha TEXT, kind TEXT, value TEXT, size INTEGER, used REAL,"
+                 " PRIMARY KEY (sha, kind))")
+    conn.execute("INSERT INTO texts VALUES ('a', 'text', 'abc', 3, 0)")
+    conn.commit()
+    conn.close()
+    assert stored_total(text_cache.TextCache(path)) == (3, 3)
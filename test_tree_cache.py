@@ -0,0 +1,32 @@
+import http_client
+import tree_cache
+from github_stub import GitHubStub
+
+REPO = "owner/repo"
+
+
+def test_identical_branches_download_one_tree():
+    branches = {"main": {"a.txt": b"a"}, "copy": {"a.txt": b"a"}, "dev": {"b.txt": b"b"}}
+    with GitHubStub(branches) as stub:
+        session = http_client.github_session({})
+        cache = tree_cache.TreeCache()
+        trees = [cache.get_tree_at(session, stub.url, REPO, stub.commit_sha(name)) for name in branches]
+        assert trees[0] is trees[1]
+        assert [item["path"] for item in trees[2].items] == ["b.txt"]
+        assert stub.calls["tree"] == 2
+        assert stub.calls["commit"] == 3
+
+        # Known heads cost nothing
+        cache.get_tree_at(session, stub.url, REPO, stub.commit_sha("main"))
+        assert (stub.calls["tree"], stub.calls["commit"]) == (2, 3)
+
+
+def test_evicting_a_tree_forgets_its_heads():
+    branches = {name: {f"{name}.txt": name.encode()} for name in ("a", "b", "c")}
+    with GitHubStub(branches) as stub:
+        session = http_client.github_session({})
+        cache = tree_cache.TreeCache(max_trees=2)
+        for name in branches:
+            cache.get_tree_at(session, stub.url, REPO, stub.commit_sha(name))
+        assert len(cache._trees) == 2
+        assert set(cache._head_trees.values()) == set(cache._trees)
@@ -0,0 +1,131 @@
+import importlib
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+import issue_record
+import trend_engine
+
+
+def resolved_at(*days):
+    return np.array([np.datetime64(day, "ms") for day in days])
+
+
+def test_rounded_days_matches_python_round():
+    # Halves where np.round and round() disagree, exact ties, and random values
+    seconds = np.concatenate([np.array([0.005, 0.015, 2.675, 1.005, 0.125]) * 86400,
+                              np.arange(0, 20000) * 432.0,
+                              np.random.default_rng(0).uniform(0, 400 * 86400, 10000)])
+    assert trend_engine.rounded_days(seconds).tolist() == [round(value / 86400, 2) for value in seconds.tolist()]
+    assert trend_engine.rounded_days(np.array([])).tolist() == []
+
+
+def test_day_buckets_with_empty_days():
+    resolved = resolved_at("2025-03-01T10:00", "2025-03-01T23:59", "2025-03-03T00:00", "2025-02-28T12:00")
+    rows = trend_engine.trend(resolved, [1.0, 2.0, 4.0, 9.0], date(2025, 3, 1), date(2025, 3, 3))
+    assert [row["date"] for row in rows] == ["2025-03-01", "2025-03-02", "2025-03-03"]
+    assert [row["resolved_count"] for row in rows] == [2, 0, 1]
+    assert [row["avg_resolution_days"] for row in rows] == [1.5, 0, 4.0]
+    assert rows[1] == {"date": "2025-03-02", "avg_resolution_days": 0, "resolved_count": 0,
+                       "p50_resolution_days": 0, "p90_resolution_days": 0}
+
+
+def test_week_buckets_start_on_monday_and_trim_to_the_window():
+    # 2025-03-05 is a Wednesday; its week starts 2025-03-03
+    resolved = resolved_at("2025-03-04", "2025-03-05", "2025-03-09", "2025-03-10", "2025-03-12", "2025-03-13")
+    rows = trend_engine.trend(resolved, [1, 2, 3, 4, 5, 6], date(2025, 3, 5), date(2025, 3, 12), "week")
+    assert [row["date"] for row in rows] == ["2025-03-03", "2025-03-10"]
+    # 03-04 is before the window and 03-13 after it
+    assert [row["resolved_count"] for row in rows] == [2, 2]
+    assert [row["avg_resolution_days"] for row in rows] == [2.5, 4.5]
+
+
+def test_month_buckets():
+    resolved = resolved_at("2025-01-31", "2025-02-01", "2025-02-28", "2025-04-15")
+    rows = trend_engine.trend(resolved, [1, 2, 4, 8], date(2025, 1, 15), date(2025, 4, 10), "month")
+    assert [row["date"] for row in rows] == ["2025-01-01", "2025-02-01", "2025-03-01", "2025-04-01"]
+    assert [row["resolved_count"] for row in rows] == [1, 2, 0, 0]
+    assert rows[1]["avg_resolution_days"] == 3.0
+
+
+def test_percentiles_match_numpy():
+    rng = np.random.default_rng(1)
+    start = date(2025, 1, 1)
+    days = rng.integers(0, 30, 2000)
+    durations = rng.exponential(5, 2000)
+    resolved = resolved_at(*(start + timedelta(days=int(day)) for day in days))
+    rows = trend_engine.trend(resolved, durations, start, start + timedelta(days=29), "week")
+    bucket_starts = trend_engine.bucket_starts(start, start + timedelta(days=29), "week").astype(date)
+    for row, first in zip(rows, bucket_starts):
+        offsets = (np.array([start + timedelta(days=int(day)) for day in days], dtype="datetime64[D]")
+                   - np.datetime64(first, "D")).astype(int)
+        values = durations[(offsets >= 0) & (offsets < 7)]
+        assert row["resolved_count"] == len(values)
+        assert row["avg_resolution_days"] == round(float(values.mean()), 2)
+        assert row["p50_resolution_days"] == round(float(np.percentile(values, 50)), 2)
+        assert row["p90_resolution_days"] == round(float(np.percentile(values, 90)), 2)
+
+
+def test_resolution_columns_skip_unresolved_and_keep_local_dates():
+    issues = [issue_record.record("A-1", "A", None, None, None,
+                                  "2025-03-01T20:00:00.000-0500", "2025-03-02T22:00:00.000-0500"),
+              issue_record.record("A-2", "A", None, None, None, "2025-03-01T00:00:00.000+0000", None)]
+    created, resolved, seconds = trend_engine.resolution_columns(issues)
+    # Bucketed by the local date even though it is 03-03 in UTC
+    assert resolved.astype("datetime64[D]").tolist() == [date(2025, 3, 2)]
+    assert seconds.tolist() == [26 * 3600]
+
+
+def test_window_parsing():
+    today = trend_engine.last_days(1)[1]
+    assert trend_engine.window({}) == (today - timedelta(days=29), today, "day")
+    assert trend_engine.window({"days": "7", "bucket": "week"}) == (today - timedelta(days=6), today, "week")
+    assert trend_engine.window({"start": "2025-01-01", "end": "2025-02-01"}) == (
+        date(2025, 1, 1), date(2025, 2, 1), "day")
+    assert trend_engine.window({}, default_start=date(2025, 1, 1))[0] == date(2025, 1, 1)
+    assert trend_engine.window({"days": "3"}, default_start=date(2025, 1, 1))[0] == today - timedelta(days=2)
+
+
+@pytest.mark.parametrize("args", [{"bucket": "year"}, {"days": "0"}, {"days": "x"}, {"start": "2025-13-01"},
+                                  {"start": "2025-02-01", "end": "2025-01-01"}])
+def test_window_rejects_bad_input(args):
+    with pytest.raises(ValueError):
+        trend_engine.window(args)
+
+
+def test_jql_window_pads_a_day_each_side():
+    assert trend_engine.jql_window("resolved", date(2025, 3, 1), date(2025, 3, 31)) == (
+        'resolved >= "2025-02-28" AND resolved < "2025-04-02"')
+
+
+@pytest.mark.parametrize("name", ["graph2", "graph3"])
+def test_routes_answer_400_on_bad_windows(name, monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    module = importlib.reload(importlib.import_module(name))
+    client = module.app.test_client()
+    for query in ("bucket=year", "days=0", "start=nope", "start=2025-02-01&end=2025-01-01"):
+        response = client.get(f"/resolution-trend?{query}")
+        assert response.status_code == 400
+        assert "error" in response.get_json()
+
+
+def test_graph_trend_pages_past_one_search(monkeypatch, tmp_path):
+    from jira_stub import JiraStub
+
+    with JiraStub(total=3600, latency=0.0) as stub:
+        monkeypatch.setenv("JIRA_URL", stub.url)
+        monkeypatch.setenv("JIRA_USER", "u")
+        monkeypatch.setenv("JIRA_TOKEN", "t")
+        monkeypatch.setenv("PROJECT_KEY", "BETA")
+        monkeypatch.chdir(tmp_path)
+        module = importlib.reload(importlib.import_module("graph"))
+        rows = module.app.test_client().get("/resolution-trend?start=2025-01-01&end=2025-07-01").get_json()
+        # 1200 BETA issues, all resolved: more than one 1000-issue search returns
+        assert sum(row["resolved_count"] for row in rows) == 1200
+
+        stub.fail_rate = 1.0
+        monkeypatch.setattr(module.jira_fetch, "RETRY_BACKOFF", 0)
+        response = module.app.test_client().get("/resolution-trend?start=2025-01-02&end=2025-07-01")
+        assert response.status_code == 500
+        assert "error" in response.get_json()
@@ -0,0 +1,101 @@
+"""On-disk cache of text extracted from repo documents, keyed by git blob SHA.
+
+A blob SHA names exact file content, so an entry never goes stale: once a
+PDF/DOCX/TXT has been parsed, later requests for the same blob skip both
+the download and the parse. Each blob can hold a first-line `description`
+and the full `text`, filled in independently by the listing and content
+routes. Total stored text is bounded; the least recently used entries are
+evicted first. Triggers keep the running total in a one-row table, so a
+put doesn't re-sum the cache.
+"""
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+# Upper bound on cached text, in UTF-8 bytes
+TEXT_CACHE_BYTES = int(os.getenv("TEXT_CACHE_BYTES", str(256 * 1024 * 1024)))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS texts (
+    sha TEXT,
+    kind TEXT,
+    value TEXT,
+    size INTEGER,
+    used REAL,
+    PRIMARY KEY (sha, kind)
+);
+CREATE INDEX IF NOT EXISTS texts_used ON texts (used);
+CREATE TABLE IF NOT EXISTS texts_size (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    total INTEGER
+);
+INSERT OR IGNORE INTO texts_size SELECT 0, COALESCE(SUM(size), 0) FROM texts;
+CREATE TRIGGER IF NOT EXISTS texts_size_insert AFTER INSERT ON texts BEGIN
+    UPDATE texts_size SET total = total + NEW.size;
+END;
+CREATE TRIGGER IF NOT EXISTS texts_size_update AFTER UPDATE OF size ON texts BEGIN
+    UPDATE texts_size SET total = total + NEW.size - OLD.size;
+END;
+CREATE TRIGGER IF NOT EXISTS texts_size_delete AFTER DELETE ON texts BEGIN
+    UPDATE texts_size SET total = total - OLD.size;
+END;
+"""
+
+
+class TextCache:
+    def __init__(self, path, max_bytes=TEXT_CACHE_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._write_lock = threading.Lock()
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get_many(self, shas, kind):
+        """{sha: value} for the given blobs that have a cached `kind`; marks them used."""
+        shas = list(dict.fromkeys(shas))
+        found = {}
+        with self._write_lock, self._connect() as conn:
+            # Stay under SQLite's bound-parameter limit
+            for start in range(0, len(shas), 500):
+                batch = shas[start:start + 500]
+                marks = ",".join("?" * len(batch))
+                found.update(conn.execute(
+                    f"SELECT sha, value FROM texts WHERE kind = ? AND sha IN ({marks})",
+                    [kind] + batch))
+            conn.executemany("UPDATE texts SET used = ? WHERE sha = ? AND kind = ?",
+                             [(time.time(), sha, kind) for sha in found])
+        return found
+
+    def get(self, sha, kind):
+        return self.get_many([sha], kind).get(sha)
+
+    def put(self, sha, kind, value):
+        size = len(value.encode("utf-8"))
+        with self._write_lock, self._connect() as conn:
+            # An upsert, not INSERT OR REPLACE, so the size triggers see the update
+            conn.execute("INSERT INTO texts VALUES (?, ?, ?, ?, ?)"
+                         " ON CONFLICT (sha, kind) DO UPDATE SET"
+                         " value = excluded.value, size = excluded.size, used = excluded.used",
+                         (sha, kind, value, size, time.time()))
+            total = conn.execute("SELECT total FROM texts_size").fetchone()[0]
+            if total <= self.max_bytes:
+                return
+            evict = []
+            for old_sha, old_kind, old_size in conn.execute(
+                    "SELECT sha, kind, size FROM texts ORDER BY used"):
+                if total <= self.max_bytes:
+                    break
+                evict.append((old_sha, old_kind))
+                total -= old_size
+            conn.executemany("DELETE FROM texts WHERE sha = ? AND kind = ?", evict)
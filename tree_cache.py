@@ -0,0 +1,115 @@
+"""Process-wide cache of recursive git trees, keyed by SHA.
+
+Looking up a branch costs one conditional `/commits/{ref}` request: GitHub
+answers 304 Not Modified (no body, and no rate-limit charge) while the head
+hasn't moved, and the parsed tree is reused. A new head is first resolved
+to its root tree SHA with a small `/git/commits/{sha}` request; if we
+already hold that tree (e.g. another branch with identical content) it is
+reused, and only a genuinely new tree is downloaded. Callers that already
+know the head SHA (a `/branches` listing carries it) skip the revalidation
+via get_tree_at.
+"""
+import os
+import threading
+from collections import OrderedDict, namedtuple
+
+Tree = namedtuple("Tree", "sha items")
+
+# Parsed trees kept in memory, least recently used evicted first
+TREE_CACHE_SIZE = int(os.getenv("TREE_CACHE_SIZE", "64"))
+
+
+class TreeCache:
+    def __init__(self, max_trees=TREE_CACHE_SIZE):
+        self.max_trees = max_trees
+        self._heads = {}                  # commits URL -> (etag, head commit sha)
+        self._head_trees = {}             # head commit sha -> root tree sha
+        self._trees = OrderedDict()       # root tree sha -> Tree
+        self._derived = {}                # (tree sha, name) -> value built from that tree
+        self._lock = threading.Lock()
+
+    def head_sha(self, session, api_url, repo, ref):
+        """Head commit SHA of `ref`, revalidated with If-None-Match."""
+        url = f"{api_url}/repos/{repo}/commits/{ref}"
+        with self._lock:
+            cached = self._heads.get(url)
+        headers = {"Accept": "application/vnd.github.sha"}
+        if cached and cached[0]:
+            headers["If-None-Match"] = cached[0]
+
+        response = session.get(url, headers=headers)
+        if response.status_code == 304 and cached:
+            return cached[1]
+        response.raise_for_status()
+        sha = response.text.strip()
+        with self._lock:
+            self._heads[url] = (response.headers.get("ETag"), sha)
+        return sha
+
+    def _lookup(self, tree_sha):
+        tree = self._trees.get(tree_sha)
+        if tree is not None:
+            self._trees.move_to_end(tree_sha)
+        return tree
+
+    def _store(self, tree):
+        self._trees[tree.sha] = tree
+        self._trees.move_to_end(tree.sha)
+        while len(self._trees) > self.max_trees:
+            evicted, _ = self._trees.popitem(last=False)
+            self._derived = {key: value for key, value in self._derived.items() if key[0] != evicted}
+            self._head_trees = {head: sha for head, sha in self._head_trees.items() if sha != evicted}
+
+    def get_tree(self, session, api_url, repo, ref):
+        """Recursive tree of `ref` as a Tree(sha, items); raises requests.HTTPError on failure."""
+        return self.get_tree_at(session, api_url, repo, self.head_sha(session, api_url, repo, ref))
+
+    def tree_sha(self, session, api_url, repo, head):
+        """Root tree SHA of head commit `head`, from the commit object (no tree listing)."""
+        with self._lock:
+            sha = self._head_trees.get(head)
+        if sha is not None:
+            return sha
+
+        response = session.get(f"{api_url}/repos/{repo}/git/commits/{head}")
+        response.raise_for_status()
+        sha = response.json()["tree"]["sha"]
+        with self._lock:
+            self._head_trees[head] = sha
+        return sha
+
+    def get_tree_by_sha(self, session, api_url, repo, tree_sha):
+        """Recursive tree with root `tree_sha`, downloaded only if we don't hold it."""
+        with self._lock:
+            tree = self._lookup(tree_sha)
+        if tree is not None:
+            return tree
+
+        response = session.get(f"{api_url}/repos/{repo}/git/trees/{tree_sha}?recursive=1")
+        response.raise_for_status()
+        data = response.json()
+        tree = Tree(data["sha"], data.get("tree", []))
+        with self._lock:
+            # Another caller may have brought in this exact tree meanwhile
+            tree = self._lookup(tree.sha) or tree
+            self._store(tree)
+        return tree
+
+    def get_tree_at(self, session, api_url, repo, head):
+        """Recursive tree of a known head commit SHA (e.g. from a `/branches` listing)."""
+        return self.get_tree_by_sha(session, api_url, repo, self.tree_sha(session, api_url, repo, head))
+
+    def derive(self, tree, name, build):
+        """Value computed once per tree version, e.g. an index over its paths."""
+        key = (tree.sha, name)
+        with self._lock:
+            if key in self._derived:
+                return self._derived[key]
+        value = build(tree)
+        with self._lock:
+            if tree.sha in self._trees:
+                self._derived[key] = value
+        return value
+
+
+TREES = TreeCache()
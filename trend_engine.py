@@ -0,0 +1,155 @@
+"""Columnar resolution-trend computation with NumPy.
+
+Issues are turned into arrays once (created/resolved as datetime64), then
+every bucket's count, mean and percentiles come out of a few vectorized
+passes (bincount for counts and sums, one lexsort for percentiles) instead
+of per-issue Python loops. Buckets are calendar days, Monday-based weeks or
+months over any [start, end] date window.
+
+Issues are bucketed by the calendar date of their resolution in the
+timestamp's own UTC offset, as the original graph routes did. Timestamps
+are decoded by jira_time.
+"""
+from datetime import date, datetime, timedelta, timezone
+
+import numpy as np
+
+import jira_time
+
+BUCKETS = ("day", "week", "month")
+
+
+def resolution_columns(issues):
+    """Arrays for the resolved IssueRecords: local created, local resolved and seconds to resolve."""
+    created_local, created = jira_time.parse_times([issue.created for issue in issues])
+    resolved_local, resolved = jira_time.parse_times([issue.resolved for issue in issues])
+    keep = ~(np.isnat(created) | np.isnat(resolved))
+    seconds = (resolved[keep] - created[keep]).astype(np.int64) / 1000.0
+    return created_local[keep], resolved_local[keep], seconds
+
+
+def rounded_days(seconds):
+    """Seconds as days rounded to 2 places, matching Python's round per value.
+
+    np.round scales by 100 before rounding, which can push a value sitting
+    next to a half onto the other side of it; those few near-halves are
+    settled with round() itself.
+    """
+    days = np.asarray(seconds, dtype=np.float64) / 86400
+    rounded = np.round(days, 2)
+    scaled = days * 100
+    near_half = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-9 * np.maximum(1.0, np.abs(scaled))
+    for n in np.flatnonzero(near_half):
+        rounded[n] = round(float(days[n]), 2)
+    return rounded
+
+
+def bucket_starts(start, end, bucket):
+    """First day of every bucket touching [start, end], as datetime64[D]."""
+    first = np.datetime64(start, "D")
+    last = np.datetime64(end, "D")
+    if bucket == "day":
+        return np.arange(first, last + 1)
+    if bucket == "week":
+        monday = first - (first.astype(np.int64) + 3) % 7   # 1970-01-01 was a Thursday
+        return np.arange(monday, last + 1, 7)
+    if bucket == "month":
+        months = np.arange(first.astype("datetime64[M]"), last.astype("datetime64[M]") + 1)
+        return months.astype("datetime64[D]")
+    raise ValueError(f"bucket must be one of {', '.join(BUCKETS)}")
+
+
+def group_percentiles(index, values, counts, percentiles):
+    """{q: per-group percentile q} (linear interpolation, as numpy.percentile); 0 for empty groups."""
+    values = values[np.lexsort((values, index))]
+    offsets = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    present = counts > 0
+    base = offsets[present]
+    result = {}
+    for q in percentiles:
+        position = (counts[present] - 1) * (q / 100.0)
+        low = np.floor(position).astype(np.int64)
+        high = np.ceil(position).astype(np.int64)
+        column = np.zeros(len(counts))
+        column[present] = values[base + low] + (values[base + high] - values[base + low]) * (position - low)
+        result[q] = column
+    return result
+
+
+def trend(resolved_local, durations, start, end, bucket="day", percentiles=(50, 90)):
+    """One row per bucket in [start, end]: date, resolved_count, avg and pNN resolution days.
+
+    `durations` are in days, one per resolved issue; empty buckets report 0.
+    A week or month bucket only counts the part of it inside the window,
+    but is dated by its first day.
+    """
+    starts = bucket_starts(start, end, bucket)
+    days = resolved_local.astype("datetime64[D]")
+    inside = (days >= np.datetime64(start, "D")) & (days <= np.datetime64(end, "D"))
+    index = np.searchsorted(starts, days[inside], side="right") - 1
+    durations = np.asarray(durations, dtype=np.float64)[inside]
+
+    groups = len(starts)
+    counts = np.bincount(index, minlength=groups)
+    sums = np.bincount(index, weights=durations, minlength=groups)
+    means = np.divide(sums, counts, out=np.zeros(groups), where=counts > 0)
+    columns = {f"p{q}_resolution_days": column
+               for q, column in group_percentiles(index, durations, counts, percentiles).items()}
+
+    # Python's round, not ndarray.round: they disagree on halves like 0.265.
+    # Empty buckets report a plain 0, as the per-day loops did.
+    counts = counts.tolist()
+    means = [round(value, 2) if count else 0 for value, count in zip(means.tolist(), counts)]
+    columns = {name: [round(value, 2) if count else 0 for value, count in zip(column.tolist(), counts)]
+               for name, column in columns.items()}
+    rows = []
+    for n, day in enumerate(starts.astype(date)):
+        row = {
+            "date": day.isoformat(),
+            "avg_resolution_days": means[n],
+            "resolved_count": counts[n]
+        }
+        for name, values in columns.items():
+            row[name] = values[n]
+        rows.append(row)
+    return rows
+
+
+def last_days(days, today=None):
+    """(start, end) dates of the `days`-day window ending today (UTC)."""
+    end = today or datetime.now(timezone.utc).date()
+    return end - timedelta(days=days - 1), end
+
+
+def window(args, default_days=30, default_start=None):
+    """(start, end, bucket) from request args.
+
+    `start`/`end` are YYYY-MM-DD dates (end defaults to today); without a
+    start the window is the last `days` days (default_days), or begins at
+    default_start when given. Raises ValueError on bad input.
+    """
+    bucket = args.get("bucket", "day")
+    if bucket not in BUCKETS:
+        raise ValueError(f"bucket must be one of {', '.join(BUCKETS)}")
+    end = date.fromisoformat(args["end"]) if args.get("end") else last_days(1)[1]
+    if args.get("start"):
+        start = date.fromisoformat(args["start"])
+    elif default_start is not None and not args.get("days"):
+        start = default_start
+    else:
+        days = int(args.get("days", default_days))
+        if days < 1:
+            raise ValueError("days must be at least 1")
+        start = last_days(days, end)[0]
+    if start > end:
+        raise ValueError("start must not be after end")
+    return start, end, bucket
+
+
+def jql_window(field, start, end):
+    """JQL for `field` within [start, end], padded a day each side; trend() trims exactly.
+
+    The padding covers Jira evaluating dates in the user's time zone while
+    buckets use each timestamp's own offset.
+    """
+    return f'{field} >= "{start - timedelta(days=1)}" AND {field} < "{end + timedelta(days=2)}"'